@@ -15,16 +15,76 @@ Features:
 import os
 import json
 import time
+import atexit
+import queue
+import threading
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Callable
 from pathlib import Path
 import csv
 
+# Log lines from every SortLogger go through one queue to a background
+# writer thread, so sorting loops never block on log file I/O
+_log_queue = queue.Queue()
+_log_thread = None
+_log_thread_lock = threading.Lock()
+
+
+def _log_writer():
+    """Append queued (log path, line) pairs, one open/write per run of lines for a file"""
+    while True:
+        batch = [_log_queue.get()]
+        # Take everything else already waiting
+        try:
+            while True:
+                batch.append(_log_queue.get_nowait())
+        except queue.Empty:
+            pass
+        
+        try:
+            start = 0
+            while start < len(batch):
+                path = batch[start][0]
+                end = start
+                while end < len(batch) and batch[end][0] == path:
+                    end += 1
+                try:
+                    with open(path, 'a', encoding='utf-8') as f:
+                        f.write(''.join(line for _, line in batch[start:end]))
+                except OSError:
+                    pass  # an unwritable log must not take the writer down
+                start = end
+        finally:
+            for _ in batch:
+                _log_queue.task_done()
+
+
+def _enqueue_log_line(path: str, line: str):
+    """Hand a line to the writer thread, starting it on first use"""
+    global _log_thread
+    if _log_thread is None:
+        with _log_thread_lock:
+            if _log_thread is None:
+                _log_thread = threading.Thread(target=_log_writer, name="sort-log-writer", daemon=True)
+                _log_thread.start()
+    _log_queue.put((path, line))
+
+
+def flush_logs():
+    """Block until every queued log line is on disk"""
+    if _log_thread is not None:
+        _log_queue.join()
+
+
+# The writer is a daemon thread; don't lose the tail of the log at exit
+atexit.register(flush_logs)
+
 class SortLogger:
     """Enhanced logging system for sorting operations"""
     
-    def __init__(self, log_dir: Optional[str] = None):
+    def __init__(self, log_dir: Optional[str] = None, debug: bool = False):
         self.log_dir = log_dir or os.getcwd()
+        self.debug = debug  # callers check this before building DEBUG messages
         self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
         self.start_time = time.time()
         
@@ -93,9 +153,11 @@ class SortLogger:
             if self.progress_callback:
                 self.progress_callback(completed, total, current_item)
             
-            # Log milestone progress
+            # Log milestone progress; with a callback already showing progress
+            # (e.g. the CLI's in-place line), it goes to the log file only
             if completed > 0 and completed % 50 == 0:
-                self._write_log(f"Progress: {completed}/{total} - {current_item}")
+                self._write_log(f"Progress: {completed}/{total} - {current_item}",
+                                echo=not self.progress_callback)
     
     def log_config(self, key: str, value: str):
         """Log configuration setting"""
@@ -105,6 +167,11 @@ class SortLogger:
         """Log info message"""
         self._write_log(message)
     
+    def log_debug(self, message: str):
+        """Log debug message (dropped unless debug logging is on)"""
+        if self.debug:
+            self._write_log(f"DEBUG: {message}")
+    
     def log_error(self, message: str, file_path: str = "", operation: str = ""):
         """Log error message with optional context"""
         error_record = {
@@ -330,16 +397,20 @@ class SortLogger:
         self._write_log(f"Results exported to: {export_path}")
         return export_path
     
-    def _write_log(self, message: str):
-        """Write message to log file"""
+    def _write_log(self, message: str, echo: bool = True):
+        """Write message to log file (queued for the background writer), and to the console if echo"""
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         log_line = f"[{timestamp}] {message}\n"
         
-        with open(self.main_log, 'a', encoding='utf-8') as f:
-            f.write(log_line)
+        _enqueue_log_line(self.main_log, log_line)
         
         # Also print to console
-        print(message)
+        if echo:
+            print(message)
+    
+    def flush(self):
+        """Wait until all queued log lines have been written"""
+        flush_logs()
     
     def _write_error_csv(self, error_record: Dict[str, str]):
         """Write error to CSV file"""
@@ -407,7 +478,7 @@ if __name__ == "__main__":
     logger.start_operation("Test Sort", 10)
     
     for i in range(10):
-        logger.update_progress(i + 1, f"test_file_{i}.png")
+        logger.update_progress(i + 1, 10, f"test_file_{i}.png")
         logger.log_file_operation("move", f"test_file_{i}.png", "sorted/folder/", success=True)
         time.sleep(0.1)  # Simulate processing time
     
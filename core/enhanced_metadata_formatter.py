@@ -5,7 +5,6 @@ Creates comprehensive, beautifully formatted metadata text files
 with all ComfyUI workflow information in a readable format.
 """
 
-import json
 import os
 import re
 from typing import Dict, Any, Optional, List, Tuple
@@ -14,8 +13,11 @@ from datetime import datetime
 class EnhancedMetadataFormatter:
     """Creates comprehensive, formatted metadata text files"""
     
-    def __init__(self):
+    def __init__(self, checkpoint_lookup=None):
         self.separator = "=" * 50
+        # Callable returning the primary checkpoint for a metadata dict; callers
+        # that analyze the same dict several times can pass a memoized one
+        self.checkpoint_lookup = checkpoint_lookup
         
     def format_metadata_to_text(self, metadata: Dict[str, Any], image_path: str) -> str:
         """
@@ -70,6 +72,12 @@ class EnhancedMetadataFormatter:
     def get_base_model(self, metadata: Dict[str, Any]) -> Optional[str]:
         """Extract base model name for grouping (ignoring refiner models)"""
         # Use the same method as MetadataAnalyzer for consistency
+        return self._primary_checkpoint(metadata)
+    
+    def _primary_checkpoint(self, metadata: Dict[str, Any]) -> Optional[str]:
+        """Primary checkpoint via the injected lookup, else MetadataAnalyzer"""
+        if self.checkpoint_lookup is not None:
+            return self.checkpoint_lookup(metadata)
         from .metadata_engine import MetadataAnalyzer
         return MetadataAnalyzer.extract_primary_checkpoint(metadata)
     
@@ -136,8 +144,7 @@ Generated: {timestamp}
         lines = ["=== MODELS ==="]
         
         # Use the same extraction method as MetadataAnalyzer for consistency
-        from .metadata_engine import MetadataAnalyzer
-        base_model = MetadataAnalyzer.extract_primary_checkpoint(metadata)
+        base_model = self._primary_checkpoint(metadata)
         vae = None
         
         for node_id, node_data in metadata.items():
@@ -0,0 +1,144 @@
+"""
+Sorter 2.0 - Shared File Operations
+
+File moves and copies, pooled transfers and destination name
+bookkeeping used by the sorters.
+"""
+
+import os
+import sys
+import errno
+import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Optional
+
+# Batches with at least this many files copy on a thread pool
+PARALLEL_TRANSFER_MIN_FILES = 32
+TRANSFER_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+
+# Windows and (by default) macOS filesystems treat names differing only
+# in case as the same file
+_CASE_INSENSITIVE = os.path.normcase('A') == 'a' or sys.platform == 'darwin'
+
+# Path separators and characters Windows forbids in folder names
+_NAME_TRANS = str.maketrans({c: '_' for c in '<>:"|?*\\/'})
+
+
+def safe_folder_name(name: str) -> str:
+    """Replace path separators and characters Windows forbids in folder names"""
+    return name.translate(_NAME_TRANS)
+
+
+def move_file(src: str, dst: str, same_device: bool, rename=os.rename):
+    """
+    Rename when source and target share a filesystem, else shutil.move.
+    rename: the same-device rename to use, called as rename(src, dst)
+    """
+    if same_device:
+        try:
+            rename(src, dst)
+            return
+        except OSError as e:
+            # A nested mount point can still put the file on another device
+            if e.errno != errno.EXDEV:
+                raise
+    shutil.move(src, dst)
+
+
+def link_or_copy(src: str, dst: str) -> str:
+    """Hard-link dst to src (same inode, no data copied); copy2 where links aren't possible"""
+    try:
+        os.link(src, dst)
+        return "LINKED"
+    except OSError:
+        # Cross-device, or a filesystem without hard links
+        shutil.copy2(src, dst)
+        return "COPIED"
+
+
+def name_key(name: str) -> str:
+    """Form of a file name used to compare it with others in the same folder"""
+    return name.casefold() if _CASE_INSENSITIVE else name
+
+
+def transfer_pool(file_count: int, move_files: bool, same_device: bool) -> Optional[ThreadPoolExecutor]:
+    """Thread pool for a batch's transfers, or None when they should run on the calling thread"""
+    # Copies (and cross-device moves) are I/O-bound and release the GIL,
+    # so bigger batches run them on a thread pool; same-device renames
+    # are too cheap to be worth handing off
+    if file_count >= PARALLEL_TRANSFER_MIN_FILES and not (move_files and same_device):
+        return ThreadPoolExecutor(max_workers=TRANSFER_WORKERS)
+    return None
+
+
+def finish_transfers(pool: ThreadPoolExecutor, transfers: Dict, logger, progress_callback=None) -> int:
+    """
+    Log pooled transfers as they complete and shut the pool down.
+    transfers maps each future (returning the operation name) to its
+    (source, destination); returns how many succeeded
+    """
+    succeeded = 0
+    try:
+        for done, future in enumerate(as_completed(transfers), 1):
+            file_path, dest_path = transfers[future]
+            if progress_callback:
+                progress_callback(done, len(transfers), os.path.basename(file_path))
+            try:
+                operation = future.result()
+            except Exception as e:
+                logger.log_error(f"Failed to sort file: {str(e)}", file_path, "File Operation")
+                continue
+            logger.log_file_operation(operation, file_path, dest_path)
+            succeeded += 1
+    finally:
+        pool.shutdown()
+    return succeeded
+
+
+class DestinationNames:
+    """
+    File names in each destination folder, listed once per run and kept
+    current as names are handed out, so conflicts are checked here
+    rather than with a stat per candidate name. Names are kept as
+    name_key() forms, so on case-insensitive platforms IMG.png and
+    img.png conflict just as they would on disk
+    """
+    
+    def __init__(self):
+        self._folders = {}
+    
+    def clear(self):
+        """Forget every folder (start of a run)"""
+        self._folders.clear()
+    
+    def mark_empty(self, folder: str):
+        """Record a folder just created, so it is never listed"""
+        self._folders[folder] = set()
+    
+    def _names(self, folder: str) -> set:
+        names = self._folders.get(folder)
+        if names is None:
+            try:
+                with os.scandir(folder) as entries:
+                    names = {name_key(entry.name) for entry in entries}
+            except FileNotFoundError:
+                names = set()
+            self._folders[folder] = names
+        return names
+    
+    def add(self, folder: str, filename: str):
+        """Mark a name in folder as taken"""
+        self._names(folder).add(name_key(filename))
+    
+    def claim(self, folder: str, filename: str) -> str:
+        """Take filename in folder, or the first free name_1, name_2, ... variant of it"""
+        names = self._names(folder)
+        if name_key(filename) in names:
+            base, ext = os.path.splitext(filename)
+            counter = 1
+            filename = f"{base}_{counter}{ext}"
+            while name_key(filename) in names:
+                counter += 1
+                filename = f"{base}_{counter}{ext}"
+        names.add(name_key(filename))
+        return filename
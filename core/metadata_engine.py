@@ -17,12 +17,169 @@ import sys
 from typing import Dict, Any, Optional, List, Tuple
 from pathlib import Path
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from PIL import Image
 
+try:
+    import orjson  # optional: faster parsing of large ComfyUI workflow JSON
+except ImportError:
+    orjson = None
+
+
+def json_loads(data):
+    """Parse JSON with orjson when it is installed, otherwise the stdlib"""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson rejects some input the stdlib accepts (e.g. NaN/Infinity)
+            pass
+    return json.loads(data)
+
+def read_png_metadata(image_path: str) -> Tuple[Optional[Dict[str, Any]], str, str]:
+    """
+    Read ComfyUI metadata from a single image without touching shared state
+    
+    Safe to call from worker threads; MetadataExtractor records the returned
+    outcome in its statistics on the calling thread.
+    
+    Args:
+        image_path: Path to the image file
+        
+    Returns:
+        Tuple of (metadata or None, statistics key for the outcome, error message)
+    """
+    try:
+        # Method 1: Standard PIL extraction
+        with Image.open(image_path) as img:
+            # Try 'prompt' field first (ComfyUI standard)
+            prompt_data = img.info.get('prompt')
+            if prompt_data:
+                return json_loads(prompt_data), 'successful_extractions', ''
+            
+            # Method 2: Try 'parameters' field (fallback)
+            params_data = img.info.get('parameters')
+            if params_data:
+                return json_loads(params_data), 'successful_extractions', ''
+            
+            # Method 3: Try other common metadata fields
+            for field in ['workflow', 'extra_pnginfo', 'exif']:
+                data = img.info.get(field)
+                if data:
+                    try:
+                        if isinstance(data, str):
+                            metadata = json_loads(data)
+                        else:
+                            metadata = data
+                        return metadata, 'successful_extractions', ''
+                    except (json.JSONDecodeError, TypeError):
+                        continue
+            
+            # No metadata found
+            return None, 'no_metadata_files', ''
+            
+    except (OSError, IOError) as e:
+        # File corruption or access issues
+        return None, 'corrupted_files', f"File access error: {str(e)}"
+        
+    except MemoryError as e:
+        # Memory issues with large files
+        return None, 'memory_errors', f"Memory error: {str(e)}"
+        
+    except Exception as e:
+        # Unexpected errors
+        return None, 'failed_extractions', f"Unexpected error: {str(e)}"
+
+
+class MetadataCache:
+    """
+    On-disk cache of extracted metadata, keyed by absolute path and
+    validated against the file's mtime and size
+    
+    Lets repeated runs over the same folder (checkpoint sort, then LoRA
+    search, then keyword search) skip re-parsing unchanged images.
+    """
+    
+    # Only settled outcomes are cached; read errors are retried next run
+    CACHEABLE_OUTCOMES = ('successful_extractions', 'no_metadata_files')
+    
+    # Entries kept on save, most recently used first; the whole file is
+    # loaded at startup, so it can't grow without bound
+    MAX_ENTRIES = 5000
+    
+    def __init__(self, cache_path: str):
+        self.cache_path = cache_path
+        self.entries = {}
+        self.dirty = False
+        self.load()
+    
+    def load(self):
+        """Load the cache file, starting empty if it is missing or unreadable"""
+        try:
+            with open(self.cache_path, 'rb') as f:
+                self.entries = json_loads(f.read())
+        except (OSError, ValueError):
+            self.entries = {}
+        self.dirty = False
+    
+    def save(self):
+        """Write the cache back if anything changed, dropping entries for vanished files"""
+        if not self.dirty:
+            return
+        
+        # Sorting moves files, so paths go stale; entries are in least- to
+        # most-recently-used order, so a cap keeps the newest
+        live = [(path, entry) for path, entry in self.entries.items() if os.path.exists(path)]
+        self.entries = dict(live[-self.MAX_ENTRIES:])
+        
+        tmp_path = self.cache_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            if orjson is not None:
+                f.write(orjson.dumps(self.entries))
+            else:
+                f.write(json.dumps(self.entries).encode('utf-8'))
+        os.replace(tmp_path, self.cache_path)
+        self.dirty = False
+    
+    def lookup(self, image_path: str) -> Tuple[Optional[Tuple[Optional[Dict], str]], Optional[Tuple[int, int]]]:
+        """
+        Look up an image
+        
+        Returns:
+            Tuple of ((metadata, outcome) or None on a miss, file signature for store())
+        """
+        try:
+            st = os.stat(image_path)
+        except OSError:
+            return None, None
+        signature = (st.st_mtime_ns, st.st_size)
+        key = os.path.abspath(image_path)
+        entry = self.entries.get(key)
+        if entry and entry[0] == signature[0] and entry[1] == signature[1]:
+            # Move to the end, so the cap in save() keeps it; the new order
+            # has to be written back too
+            self.entries[key] = self.entries.pop(key)
+            self.dirty = True
+            return (entry[3], entry[2]), signature
+        return None, signature
+    
+    def store(self, image_path: str, signature: Optional[Tuple[int, int]], outcome: str, metadata):
+        """Remember a freshly extracted result"""
+        if signature is None or outcome not in self.CACHEABLE_OUTCOMES:
+            return
+        if metadata is not None and not isinstance(metadata, (dict, list)):
+            return  # e.g. raw EXIF bytes, which JSON can't hold
+        key = os.path.abspath(image_path)
+        self.entries.pop(key, None)  # re-inserted at the end, as most recent
+        self.entries[key] = [signature[0], signature[1], outcome, metadata]
+        self.dirty = True
+
+
 class MetadataExtractor:
     """Bulletproof metadata extraction for ComfyUI images"""
     
-    def __init__(self):
+    def __init__(self, cache: Optional[MetadataCache] = None):
+        self.cache = cache
         self.stats = {
             'total_processed': 0,
             'successful_extractions': 0,
@@ -43,89 +200,102 @@ class MetadataExtractor:
         Returns:
             Dictionary of metadata or None if extraction fails
         """
-        try:
-            # Method 1: Standard PIL extraction
-            with Image.open(image_path) as img:
-                # Try 'prompt' field first (ComfyUI standard)
-                prompt_data = img.info.get('prompt')
-                if prompt_data:
-                    metadata = json.loads(prompt_data)
-                    self.stats['successful_extractions'] += 1
-                    return metadata
-                
-                # Method 2: Try 'parameters' field (fallback)
-                params_data = img.info.get('parameters')
-                if params_data:
-                    metadata = json.loads(params_data)
-                    self.stats['successful_extractions'] += 1
-                    return metadata
-                
-                # Method 3: Try other common metadata fields
-                for field in ['workflow', 'extra_pnginfo', 'exif']:
-                    data = img.info.get(field)
-                    if data:
-                        try:
-                            if isinstance(data, str):
-                                metadata = json.loads(data)
-                            else:
-                                metadata = data
-                            self.stats['successful_extractions'] += 1
-                            return metadata
-                        except (json.JSONDecodeError, TypeError):
-                            continue
-                
-                # No metadata found
-                self.stats['no_metadata_files'] += 1
-                return None
-                
-        except (OSError, IOError) as e:
-            # File corruption or access issues
-            self.stats['corrupted_files'] += 1
-            self.failed_files.append((image_path, f"File access error: {str(e)}"))
-            return None
-            
-        except MemoryError as e:
-            # Memory issues with large files
-            self.stats['memory_errors'] += 1 
-            self.failed_files.append((image_path, f"Memory error: {str(e)}"))
-            return None
-            
-        except Exception as e:
-            # Unexpected errors
-            self.stats['failed_extractions'] += 1
-            self.failed_files.append((image_path, f"Unexpected error: {str(e)}"))
-            return None
+        metadata, outcome, error = read_png_metadata(image_path)
+        self._record_outcome(image_path, outcome, error)
+        return metadata
+    
+    def _record_outcome(self, image_path: str, outcome: str, error: str):
+        """Record the result of one extraction in the statistics"""
+        self.stats[outcome] += 1
+        if error:
+            self.failed_files.append((image_path, error))
     
-    def extract_batch(self, image_paths: List[str], progress_callback=None) -> Dict[str, Optional[Dict]]:
+    def extract_batch(
+        self,
+        image_paths: List[str],
+        progress_callback=None,
+        max_workers: int = 1,
+        executor=None,
+        on_result=None,
+        keep_results: bool = True
+    ) -> Dict[str, Optional[Dict]]:
         """
         Extract metadata from multiple images with progress tracking
         
         Args:
             image_paths: List of image file paths
             progress_callback: Optional callback function for progress updates
+            max_workers: Number of threads reading files concurrently (1 = serial)
+            executor: Optional caller-owned executor (e.g. a ProcessPoolExecutor)
+                to run the reads on instead; takes precedence over max_workers
+            on_result: Optional callback(image_path, metadata) invoked for each
+                file, in input order, as soon as its result is available
+            keep_results: False to hand each result only to on_result, so a
+                streaming caller never holds the whole batch in memory
             
         Returns:
-            Dictionary mapping file paths to metadata (or None if failed)
+            Dictionary mapping file paths to metadata (or None if failed);
+            empty when keep_results is False
         """
         results = {}
         total_files = len(image_paths)
         
-        for i, image_path in enumerate(image_paths):
-            self.stats['total_processed'] += 1
-            
-            # Progress callback
-            if progress_callback:
-                progress_callback(i + 1, total_files, os.path.basename(image_path))
-            
-            # Extract metadata
-            metadata = self.extract_single(image_path)
-            results[image_path] = metadata
-            
-            # Memory management for large batches
-            if i > 0 and i % 100 == 0:
-                # Force garbage collection every 100 files
-                import gc
-                gc.collect()
+        # Split off images whose cached result is still valid
+        cached = {}
+        signatures = {}
+        to_read = image_paths
+        if self.cache is not None:
+            to_read = []
+            for image_path in image_paths:
+                hit, signatures[image_path] = self.cache.lookup(image_path)
+                if hit:
+                    cached[image_path] = hit
+                else:
+                    to_read.append(image_path)
+        
+        # File reads overlap across worker threads; statistics and progress
+        # are still updated here, in input order
+        own_executor = None
+        if executor is not None:
+            # Chunking keeps per-task IPC overhead low for process pools
+            outcomes = executor.map(read_png_metadata, to_read, chunksize=16)
+        elif max_workers and max_workers > 1 and len(to_read) > 1:
+            own_executor = ThreadPoolExecutor(max_workers=max_workers)
+            outcomes = own_executor.map(read_png_metadata, to_read)
+        else:
+            outcomes = map(read_png_metadata, to_read)
+        
+        try:
+            for i, image_path in enumerate(image_paths):
+                if image_path in cached:
+                    metadata, outcome = cached[image_path]
+                    error = ''
+                else:
+                    metadata, outcome, error = next(outcomes)
+                    if self.cache is not None:
+                        self.cache.store(image_path, signatures[image_path], outcome, metadata)
+                
+                self.stats['total_processed'] += 1
+                
+                # Progress callback
+                if progress_callback:
+                    progress_callback(i + 1, total_files, os.path.basename(image_path))
+                
+                self._record_outcome(image_path, outcome, error)
+                if keep_results:
+                    results[image_path] = metadata
+                
+                if on_result:
+                    on_result(image_path, metadata)
+                
+                # Memory management for large batches
+                if i > 0 and i % 100 == 0:
+                    # Force garbage collection every 100 files
+                    import gc
+                    gc.collect()
+        finally:
+            if own_executor:
+                own_executor.shutdown()
         
         return results
     
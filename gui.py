@@ -7,6 +7,7 @@ Built on the rock-solid command-line backend for maximum reliability.
 
 import os
 import sys
+import time
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 import customtkinter as ctk
@@ -23,16 +24,92 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.append(parent_dir)
 
 from core.metadata_engine import MetadataExtractor, MetadataAnalyzer
-from core.diagnostics import SortLogger
+from core.diagnostics import SortLogger, flush_logs
 from sorters.checkpoint_sorter import CheckpointSorter
 from sorters.metadata_search import MetadataSearchSorter
-from sorters.color_sorter import ColorSorter
+from sorters.color_sorter import ColorSorter, IMAGE_EXTENSIONS
 from sorters.image_flattener import ImageFlattener
 
 # Set appearance mode and color theme
 ctk.set_appearance_mode("dark")  # "light" or "dark"
 ctk.set_default_color_theme("blue")  # "blue", "green", "dark-blue"
 
+# Progress polling interval - one mainloop wake per frame (~30 Hz)
+PROGRESS_POLL_MS = 33
+
+# Minimum seconds between progress updates forwarded to the UI (~30 Hz)
+PROGRESS_MIN_INTERVAL = 0.033
+
+# Static option values shared by the form builders and operation handlers
+SEARCH_MODES = ("Any term (OR)", "All terms (AND)", "Exact match")
+MODE_MAPPING = {
+    "Any term (OR)": "any",
+    "All terms (AND)": "all",
+    "Exact match": "exact"
+}
+GROUPING_OPTIONS = ("Checkpoint Only", "Checkpoint + LoRA Stack")
+
+# Worker threads for per-file processing (search and color sorting)
+DEFAULT_WORKERS = min(8, os.cpu_count() or 1)
+MAX_WORKERS = 32
+
+# Largest slice of a session log loaded into the viewer
+LOG_VIEW_CAP = 2 * 1024 * 1024
+
+# Image types accepted by the color sorter, for str.endswith
+IMAGE_EXT_SUFFIXES = tuple(sorted(IMAGE_EXTENSIONS))
+
+
+def _iter_files(directory, suffixes):
+    """Yield paths of regular files in a directory whose names end with one of `suffixes`"""
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.name.lower().endswith(suffixes) and entry.is_file():
+                yield entry.path
+
+
+def _count_files(directory, suffixes):
+    """Count matching files without keeping their names around"""
+    return sum(1 for _ in _iter_files(directory, suffixes))
+
+
+def _read_log_tail(log_path, cap=LOG_VIEW_CAP):
+    """Read at most the last `cap` bytes of a log file, aligned to a line start"""
+    size = os.path.getsize(log_path)
+    with open(log_path, 'rb') as f:
+        if size > cap:
+            f.seek(size - cap)
+            f.readline()  # skip the partial first line
+        content = f.read().decode('utf-8', 'replace')
+    
+    if size > cap:
+        content = f"…(truncated, showing last {cap // 1024} KB)\n" + content
+    return content
+
+
+def _throttled_progress(progress_window, min_interval=PROGRESS_MIN_INTERVAL):
+    """Build a progress callback that forwards at most one update per interval (plus the last one)"""
+    last_update = [0.0]
+    
+    def progress_callback(completed, total, current_file):
+        now = time.monotonic()
+        if completed == total or now - last_update[0] >= min_interval:
+            last_update[0] = now
+            progress_window.enqueue(("progress", (completed, total, current_file)))
+    
+    return progress_callback
+
+
+def _clamped_float(text, default, lo=0.0, hi=1.0):
+    """Parse a numeric entry value clamped to [lo, hi], using default for empty or invalid input"""
+    if not text:
+        return default
+    try:
+        value = float(text)
+    except ValueError:
+        return default
+    return lo if value < lo else hi if value > hi else value
+
 class ProgressWindow(ctk.CTkToplevel):
     """Progress tracking window with real-time updates"""
     
@@ -152,40 +229,36 @@ class ProgressWindow(ctk.CTkToplevel):
     def log_message(self, message):
         self.log_text.insert("end", f"{message}\n")
         self.log_text.see("end")
-        self.update()
     
     def check_progress(self):
         """Check for progress updates from the queue"""
+        # Drain everything queued since the last tick; producers only put,
+        # so the mainloop wakes at a fixed rate however fast they enqueue
         log_batch = []
-        try:
-            while True:
+        while True:
+            try:
                 update_type, data = self.progress_queue.get_nowait()
+            except queue.Empty:
+                break
 
-                if update_type == "operation":
-                    self.update_operation(data)
-                elif update_type == "progress":
-                    completed, total, current_file = data
-                    self.update_progress(completed, total, current_file)
-                elif update_type == "log":
-                    log_batch.append(data)
-                elif update_type == "complete":
-                    self.on_complete(data)
-                elif update_type == "error":
-                    self.on_error(data)
-
-                if len(log_batch) >= 10:
-                    self.log_message("\n".join(log_batch))
-                    log_batch = []
-
-        except queue.Empty:
-            pass
+            if update_type == "operation":
+                self.update_operation(data)
+            elif update_type == "progress":
+                completed, total, current_file = data
+                self.update_progress(completed, total, current_file)
+            elif update_type == "log":
+                log_batch.append(data)
+            elif update_type == "complete":
+                self.on_complete(data)
+            elif update_type == "error":
+                self.on_error(data)
 
         if log_batch:
             self.log_message("\n".join(log_batch))
 
         # Schedule next check
         if not self.cancelled:
-            self.after(100, self.check_progress)
+            self.after(PROGRESS_POLL_MS, self.check_progress)
     
     def on_complete(self, success):
         if success:
@@ -208,6 +281,10 @@ class ProgressWindow(ctk.CTkToplevel):
     def on_cancel(self):
         self.cancelled = True
         self.destroy()
+    
+    def close(self):
+        """Stop polling and close the window"""
+        self.on_cancel()
 
 class SorterGUI(ctk.CTk):
     """Main Sorter 2.0 GUI Application - Compact Design"""
@@ -232,6 +309,7 @@ class SorterGUI(ctk.CTk):
         self.source_dir = ""
         self.output_dir = ""
         self.current_operation = None
+        self._logs_cache = None  # (logs dir mtime, sorted log filenames)
         
         # Setup UI
         self.setup_ui()
@@ -353,9 +431,9 @@ class SorterGUI(ctk.CTk):
         group_row = ctk.CTkFrame(self.checkpoint_frame)
         group_row.pack(fill="x", padx=15, pady=5)
         ctk.CTkLabel(group_row, text="Grouping:").pack(side="left")
-        self.checkpoint_grouping_var = ctk.StringVar(value="Checkpoint Only")
+        self.checkpoint_grouping_var = ctk.StringVar(value=GROUPING_OPTIONS[0])
         group_menu = ctk.CTkOptionMenu(group_row, variable=self.checkpoint_grouping_var,
-                                     values=["Checkpoint Only", "Checkpoint + LoRA Stack"])
+                                     values=list(GROUPING_OPTIONS))
         group_menu.pack(side="left", padx=(10, 0))
         
         # Info
@@ -377,9 +455,9 @@ class SorterGUI(ctk.CTk):
         mode_row = ctk.CTkFrame(self.search_frame)
         mode_row.pack(fill="x", padx=15, pady=5)
         ctk.CTkLabel(mode_row, text="Search Mode:").pack(side="left")
-        self.search_mode_var = ctk.StringVar(value="Any term (OR)")
+        self.search_mode_var = ctk.StringVar(value=SEARCH_MODES[0])
         search_menu = ctk.CTkOptionMenu(mode_row, variable=self.search_mode_var,
-                                      values=["Any term (OR)", "All terms (AND)", "Exact match"])
+                                      values=list(SEARCH_MODES))
         search_menu.pack(side="left", padx=(10, 20))
         
         self.search_case_var = ctk.BooleanVar(value=False)
@@ -396,7 +474,10 @@ class SorterGUI(ctk.CTk):
         opts = ctk.CTkFrame(self.search_frame)
         opts.pack(fill="x", padx=15, pady=5)
         self.search_move_var = ctk.BooleanVar(value=False)
-        ctk.CTkCheckBox(opts, text="Move files (instead of copy)", variable=self.search_move_var).pack(side="left")
+        ctk.CTkCheckBox(opts, text="Move files (instead of copy)", variable=self.search_move_var).pack(side="left", padx=(0, 20))
+        ctk.CTkLabel(opts, text="Workers:").pack(side="left")
+        self.search_workers_entry = ctk.CTkEntry(opts, width=60, placeholder_text=str(DEFAULT_WORKERS))
+        self.search_workers_entry.pack(side="left", padx=(5, 0))
         
         # Info
         info_label = ctk.CTkLabel(self.search_frame, 
@@ -440,7 +521,10 @@ class SorterGUI(ctk.CTk):
         self.color_prefix_entry.pack(side="left", padx=(5, 20))
         ctk.CTkLabel(opts2, text="Dark threshold:").pack(side="left")
         self.color_threshold_entry = ctk.CTkEntry(opts2, width=80, placeholder_text="0.1")
-        self.color_threshold_entry.pack(side="left", padx=(5, 0))
+        self.color_threshold_entry.pack(side="left", padx=(5, 20))
+        ctk.CTkLabel(opts2, text="Workers:").pack(side="left")
+        self.color_workers_entry = ctk.CTkEntry(opts2, width=60, placeholder_text=str(DEFAULT_WORKERS))
+        self.color_workers_entry.pack(side="left", padx=(5, 0))
         
         # Info
         info_label = ctk.CTkLabel(self.color_frame, 
@@ -586,12 +670,12 @@ class SorterGUI(ctk.CTk):
             return
         
         # Count PNG files
-        png_files = [f for f in os.listdir(self.source_dir) if f.lower().endswith('.png')]
-        if not png_files:
+        png_count = _count_files(self.source_dir, '.png')
+        if not png_count:
             messagebox.showerror("Error", "No PNG files found in source directory")
             return
         
-        self.log_message(f"📊 Found {len(png_files)} PNG files to sort")
+        self.log_message(f"📊 Found {png_count} PNG files to sort")
         
         # Get output directory
         output_dir = self.output_dir if self.output_dir else os.path.join(self.source_dir, "sorted")
@@ -601,7 +685,7 @@ class SorterGUI(ctk.CTk):
         create_metadata = self.checkpoint_metadata_var.get()
         rename_files = self.checkpoint_rename_var.get()
         user_prefix = self.checkpoint_prefix_entry.get().strip() if rename_files else ""
-        group_by_lora = self.checkpoint_grouping_var.get() == "Checkpoint + LoRA Stack"
+        group_by_lora = self.checkpoint_grouping_var.get() == GROUPING_OPTIONS[1]
         
         # Validate prefix if renaming
         if rename_files and not user_prefix:
@@ -610,14 +694,14 @@ class SorterGUI(ctk.CTk):
         
         # Confirm operation
         operation = "MOVE" if move_files else "COPY"
-        grouping = "Checkpoint + LoRA Stack" if group_by_lora else "Checkpoint Only"
+        grouping = GROUPING_OPTIONS[1] if group_by_lora else GROUPING_OPTIONS[0]
         
         confirmation = messagebox.askyesno(
             "Confirm Checkpoint Sorting",
             f"📋 CONFIRMATION:\n" +
             f"   Source: {self.source_dir}\n" +
             f"   Output: {output_dir}\n" +
-            f"   Files: {len(png_files)} PNG files\n" +
+            f"   Files: {png_count} PNG files\n" +
             f"   Operation: {operation}\n" +
             f"   Metadata files: {'Yes' if create_metadata else 'No'}\n" +
             f"   Grouping: {grouping}\n" +
@@ -636,11 +720,8 @@ class SorterGUI(ctk.CTk):
             try:
                 sorter = CheckpointSorter(self.logger)
                 
-                # Set up progress callback
-                def progress_callback(completed, total, current_file):
-                    progress_window.enqueue(("progress", (completed, total, current_file)))
-                
-                self.logger.set_progress_callback(progress_callback)
+                # Set up progress callback, coalesced to ~30 updates per second
+                self.logger.set_progress_callback(_throttled_progress(progress_window))
                 
                 progress_window.enqueue(("operation", "Sorting by checkpoint..."))
                 
@@ -685,21 +766,17 @@ class SorterGUI(ctk.CTk):
         search_terms = [term.strip() for term in search_text.split(",") if term.strip()]
         
         # Map GUI mode to backend mode
-        mode_mapping = {
-            "Any term (OR)": "any",
-            "All terms (AND)": "all", 
-            "Exact match": "exact"
-        }
-        search_mode = mode_mapping.get(self.search_mode_var.get(), "any")
+        search_mode = MODE_MAPPING.get(self.search_mode_var.get(), "any")
         case_sensitive = self.search_case_var.get()
         
         # Get output directory
         output_dir = self.output_dir if self.output_dir else os.path.join(self.source_dir, "search_results")
         move_files = self.search_move_var.get()
+        max_workers = int(_clamped_float(self.search_workers_entry.get().strip(), DEFAULT_WORKERS, 1, MAX_WORKERS))
         
         # Count PNG files
-        png_files = [f for f in os.listdir(self.source_dir) if f.lower().endswith('.png')]
-        if not png_files:
+        png_count = _count_files(self.source_dir, '.png')
+        if not png_count:
             messagebox.showerror("Error", "No PNG files found in source directory")
             return
         
@@ -708,7 +785,7 @@ class SorterGUI(ctk.CTk):
         confirmation = messagebox.askyesno(
             "Confirm Search & Sort",
             f"📋 SEARCH CONFIGURATION:\n" +
-            f"   Files: {len(png_files)} PNG files\n" +
+            f"   Files: {png_count} PNG files\n" +
             f"   Terms: {search_terms}\n" +
             f"   Mode: {search_mode.upper()}\n" +
             f"   Case sensitive: {case_sensitive}\n" +
@@ -727,11 +804,8 @@ class SorterGUI(ctk.CTk):
             try:
                 searcher = MetadataSearchSorter(self.logger)
                 
-                # Set up progress callback
-                def progress_callback(completed, total, current_file):
-                    progress_window.enqueue(("progress", (completed, total, current_file)))
-                
-                self.logger.set_progress_callback(progress_callback)
+                # Set up progress callback, coalesced to ~30 updates per second
+                self.logger.set_progress_callback(_throttled_progress(progress_window))
                 
                 progress_window.enqueue(("operation", f"Searching for: {', '.join(search_terms)}"))
                 
@@ -741,7 +815,9 @@ class SorterGUI(ctk.CTk):
                     search_terms=search_terms,
                     search_mode=search_mode,
                     move_files=move_files,
-                    case_sensitive=case_sensitive
+                    case_sensitive=case_sensitive,
+                    max_workers=max_workers,
+                    files=_iter_files(self.source_dir, '.png')
                 )
                 
                 # Show results
@@ -765,21 +841,14 @@ class SorterGUI(ctk.CTk):
             messagebox.showerror("Error", "Please select a source directory")
             return
         
-        # Count image files
-        from pathlib import Path
-        source_path = Path(self.source_dir)
-        image_extensions = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.webp'}
-        image_files = []
+        # Count image files in a single directory pass
+        image_count = _count_files(self.source_dir, IMAGE_EXT_SUFFIXES)
         
-        for ext in image_extensions:
-            image_files.extend(source_path.glob(f'*{ext}'))
-            image_files.extend(source_path.glob(f'*{ext.upper()}'))
-        
-        if not image_files:
+        if not image_count:
             messagebox.showerror("Error", "No image files found")
             return
         
-        self.log_message(f"📊 Found {len(image_files)} image files to sort")
+        self.log_message(f"📊 Found {image_count} image files to sort")
         
         # Get options
         output_dir = self.output_dir if self.output_dir else os.path.join(self.source_dir, "color_sorted")
@@ -789,12 +858,8 @@ class SorterGUI(ctk.CTk):
         user_prefix = self.color_prefix_entry.get().strip() if rename_files else ""
         
         # Get dark threshold
-        threshold_text = self.color_threshold_entry.get().strip()
-        try:
-            dark_threshold = float(threshold_text) if threshold_text else 0.1
-            dark_threshold = max(0.0, min(1.0, dark_threshold))
-        except ValueError:
-            dark_threshold = 0.1
+        dark_threshold = _clamped_float(self.color_threshold_entry.get().strip(), 0.1)
+        max_workers = int(_clamped_float(self.color_workers_entry.get().strip(), DEFAULT_WORKERS, 1, MAX_WORKERS))
         
         # Confirm operation
         operation = "MOVE" if move_files else "COPY"
@@ -803,7 +868,7 @@ class SorterGUI(ctk.CTk):
             f"📋 CONFIRMATION:\n" +
             f"   Source: {self.source_dir}\n" +
             f"   Output: {output_dir}\n" +
-            f"   Files: {len(image_files)} image files\n" +
+            f"   Files: {image_count} image files\n" +
             f"   Operation: {operation}\n" +
             f"   Metadata files: {'Yes' if create_metadata else 'No'}\n" +
             f"   Rename files: {'Yes' if rename_files else 'No'}\n" +
@@ -822,11 +887,8 @@ class SorterGUI(ctk.CTk):
             try:
                 color_sorter = ColorSorter(self.logger)
                 
-                # Set up progress callback
-                def progress_callback(completed, total, current_file):
-                    progress_window.enqueue(("progress", (completed, total, current_file)))
-                
-                self.logger.set_progress_callback(progress_callback)
+                # Set up progress callback, coalesced to ~30 updates per second
+                self.logger.set_progress_callback(_throttled_progress(progress_window))
                 
                 progress_window.enqueue(("operation", "Analyzing colors and sorting..."))
                 
@@ -837,7 +899,9 @@ class SorterGUI(ctk.CTk):
                     create_metadata=create_metadata,
                     ignore_dark_threshold=dark_threshold,
                     rename_files=rename_files,
-                    user_prefix=user_prefix
+                    user_prefix=user_prefix,
+                    max_workers=max_workers,
+                    files=_iter_files(self.source_dir, IMAGE_EXT_SUFFIXES)
                 )
                 
                 if success:
@@ -856,16 +920,44 @@ class SorterGUI(ctk.CTk):
             messagebox.showerror("Error", "Please select a source directory")
             return
         
-        # Preview first
-        flattener = ImageFlattener(self.logger)
-        preview_data = flattener.preview_flatten(self.source_dir)
+        # Preview first - walk the tree in the background so the UI stays responsive
+        source_dir = self.source_dir
+        scan_window = ProgressWindow(self, "Scanning Folders")
+        scan_window.enqueue(("operation", "Scanning folders for images..."))
+        
+        def run_preview():
+            try:
+                flattener = ImageFlattener(self.logger)
+                preview_data = flattener.preview_flatten(source_dir)
+                self.after(0, self._show_flatten_confirm, scan_window, flattener, source_dir, preview_data)
+            except Exception as e:
+                self.after(0, self._show_flatten_error, scan_window, str(e))
+        
+        Thread(target=run_preview, daemon=True).start()
+    
+    def _scan_cancelled(self, scan_window):
+        """Whether the user closed the scanning window before the preview finished"""
+        return scan_window.cancelled or not scan_window.winfo_exists()
+    
+    def _show_flatten_error(self, scan_window, error_msg):
+        """Close the scanning window and report a failed preview"""
+        if self._scan_cancelled(scan_window):
+            return
+        scan_window.close()
+        messagebox.showerror("Error", f"Failed to scan source directory: {error_msg}")
+    
+    def _show_flatten_confirm(self, scan_window, flattener, source_dir, preview_data):
+        """Confirm the flatten operation from preview results and launch it"""
+        if self._scan_cancelled(scan_window):
+            return
+        scan_window.close()
         
         if preview_data['total_images'] == 0:
             messagebox.showerror("Error", "No image files found in directory or subdirectories")
             return
         
         # Get options
-        output_dir = self.output_dir if self.output_dir else os.path.join(self.source_dir, "flattened")
+        output_dir = self.output_dir if self.output_dir else os.path.join(source_dir, "flattened")
         move_files = self.flatten_move_var.get()
         remove_empty = self.flatten_remove_empty_var.get()
         
@@ -874,7 +966,7 @@ class SorterGUI(ctk.CTk):
         confirmation = messagebox.askyesno(
             "Confirm Flatten Images",
             f"📋 CONFIRMATION:\n" +
-            f"   Source: {self.source_dir}\n" +
+            f"   Source: {source_dir}\n" +
             f"   Target: {output_dir}\n" +
             f"   Images: {preview_data['total_images']} files\n" +
             f"   Folders: {preview_data['folders']} folders\n" +
@@ -892,18 +984,13 @@ class SorterGUI(ctk.CTk):
         
         def run_flatten():
             try:
-                flattener = ImageFlattener(self.logger)
-                
-                # Set up progress callback
-                def progress_callback(completed, total, current_file):
-                    progress_window.enqueue(("progress", (completed, total, current_file)))
-                
-                self.logger.set_progress_callback(progress_callback)
+                # Set up progress callback, coalesced to ~30 updates per second
+                self.logger.set_progress_callback(_throttled_progress(progress_window))
                 
                 progress_window.enqueue(("operation", "Flattening image folders..."))
                 
                 success = flattener.flatten_images(
-                    source_dir=self.source_dir,
+                    source_dir=source_dir,
                     target_dir=output_dir,
                     move_files=move_files,
                     remove_empty_dirs=remove_empty
@@ -926,7 +1013,18 @@ class SorterGUI(ctk.CTk):
             messagebox.showerror("Error", "No logs directory found")
             return
         
-        log_files = [f for f in os.listdir(logs_dir) if f.startswith('sort_') and f.endswith('.log')]
+        # Reuse the previous listing while the logs directory is unchanged
+        dir_mtime = os.stat(logs_dir).st_mtime_ns
+        if self._logs_cache and self._logs_cache[0] == dir_mtime:
+            log_files = self._logs_cache[1]
+        else:
+            with os.scandir(logs_dir) as entries:
+                log_files = sorted(
+                    (entry.name for entry in entries
+                     if entry.name.startswith('sort_') and entry.name.endswith('.log')),
+                    reverse=True
+                )
+            self._logs_cache = (dir_mtime, log_files)
         
         if not log_files:
             messagebox.showerror("Error", "No log files found")
@@ -936,7 +1034,7 @@ class SorterGUI(ctk.CTk):
         self.show_log_viewer(logs_dir, log_files)
     
     def show_log_viewer(self, logs_dir, log_files):
-        """Show a dialog to select and view log files"""
+        """Show a dialog to select and view log files (newest first)"""
         log_window = ctk.CTkToplevel(self)
         log_window.title("📊 Session Logs")
         log_window.geometry("800x600")
@@ -962,11 +1060,11 @@ class SorterGUI(ctk.CTk):
         
         ctk.CTkLabel(select_frame, text="Select log file:", font=ctk.CTkFont(size=14, weight="bold")).pack(anchor="w", padx=15, pady=(15, 5))
         
-        log_var = ctk.StringVar(value=sorted(log_files, reverse=True)[0])
+        log_var = ctk.StringVar(value=log_files[0])
         log_menu = ctk.CTkOptionMenu(
             select_frame,
             variable=log_var,
-            values=sorted(log_files, reverse=True)[:10],  # Show last 10 log files
+            values=log_files[:10],  # Show last 10 log files
             command=lambda choice: self.load_log_content(logs_dir, choice, log_text)
         )
         log_menu.pack(anchor="w", padx=15, pady=(0, 15))
@@ -987,18 +1085,27 @@ class SorterGUI(ctk.CTk):
         ).pack(pady=(0, 20))
     
     def load_log_content(self, logs_dir, log_file, text_widget):
-        """Load and display log file content"""
-        try:
-            log_path = os.path.join(logs_dir, log_file)
-            with open(log_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
+        """Load and display log file content without blocking the mainloop"""
+        log_path = os.path.join(logs_dir, log_file)
+        text_widget.delete("1.0", "end")
+        text_widget.insert("1.0", "Loading...")
+        
+        def show_content(content):
+            if not text_widget.winfo_exists():
+                return
             text_widget.delete("1.0", "end")
             text_widget.insert("1.0", content)
-            
-        except Exception as e:
-            text_widget.delete("1.0", "end")
-            text_widget.insert("1.0", f"Error loading log file: {e}")
+        
+        def read_log():
+            try:
+                # Off the mainloop, so waiting for queued log lines can't freeze the UI
+                flush_logs()
+                content = _read_log_tail(log_path)
+            except Exception as e:
+                content = f"Error loading log file: {e}"
+            text_widget.after(0, show_content, content)
+        
+        Thread(target=read_log, daemon=True).start()
 
 def main():
     """Launch the Sorter 2.0 GUI"""
@@ -24,52 +24,180 @@ import os
 import sys
 import json
 import re
+import stat
+import subprocess
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
+from typing import Callable, List, Optional
 
 # Add current directory to path for imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 sys.path.append(parent_dir)
 
-from core.metadata_engine import MetadataExtractor, MetadataAnalyzer
-from core.diagnostics import SortLogger
-from sorters.checkpoint_sorter import CheckpointSorter
-from sorters.metadata_search import MetadataSearchSorter
-from sorters.color_sorter import ColorSorter
-from sorters.image_flattener import ImageFlattener
+# Sorter modules pull in PIL and are imported where they are used, so
+# starting the menu (or just viewing logs) stays fast
+from core.diagnostics import SortLogger, flush_logs
+
+
+def _make_progress(min_interval=0.1):
+    """
+    Build a progress callback that redraws one console line in place,
+    at most every `min_interval` seconds (plus the final update)
+    """
+    last = [0.0]
+    
+    def progress(completed, total, current_item=""):
+        now = time.monotonic()
+        done = total and completed >= total
+        if not done and now - last[0] < min_interval:
+            return
+        last[0] = now
+        sys.stdout.write(f"\r   Progress: {completed}/{total}" + ("\n" if done else ""))
+        sys.stdout.flush()
+    
+    return progress
+
+
+# Characters that can't appear in a folder name built from user text
+_SANITIZE_RE = re.compile(r'[ /\\]')
+
+
+def _sanitize(text):
+    """Make user text safe to use as a folder name"""
+    return _SANITIZE_RE.sub('_', text)
+
+
+def _split_terms(text):
+    """Split comma-separated search terms, dropping blanks"""
+    return [term for term in map(str.strip, text.split(',')) if term]
+
+
+def _ask(prompt=""):
+    """
+    Prompt for one line of input. Interactive terminals keep input() and its
+    line editing; piped stdin is read directly, bypassing the readline hook.
+    """
+    if sys.stdin.isatty():
+        return input(prompt)
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip('\n')
+
+
+# Main menu, written in one call per loop instead of a print per line
+MENU = (
+    "\n📋 SORTING OPTIONS:\n"
+    "1. 🎯 Sort by Base Checkpoint (Most Used)\n"
+    "2. 🔍 Search & Sort by Metadata\n"
+    "3. 🌈 Sort by Color\n"
+    "4. 📂 Flatten Image Folders\n"
+    "5. 📊 View Previous Session Logs\n"
+    "0. ❌ Exit\n"
+)
+
+def _list_images(path):
+    """List paths of all image types the color sorter accepts, with a single scandir pass"""
+    from sorters.color_sorter import IMAGE_EXTENSIONS
+    
+    with os.scandir(path) as entries:
+        return [entry.path for entry in entries
+                if os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS
+                and entry.is_file()]
+
+
+# Every letter-case spelling of ".png", so names can be matched without .lower()
+_PNG_SUFFIXES = ('.png', '.PNG', '.Png', '.pNg', '.pnG', '.PNg', '.PnG', '.pNG')
+
+
+def _list_pngs(path):
+    """List PNG paths in a directory with a single scandir pass"""
+    with os.scandir(path) as entries:
+        return [entry.path for entry in entries
+                if entry.name.endswith(_PNG_SUFFIXES) and entry.is_file()]
+
+
+def _tail_lines(path, count, window=64 * 1024):
+    """Return the last `count` lines of a file, reading at most `window` bytes from its end"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        f.seek(max(0, size - window))
+        lines = f.read().decode('utf-8', errors='replace').splitlines()
+    
+    # Drop the partial first line when the window starts mid-file
+    if size > window:
+        lines = lines[1:]
+    return lines[-count:]
+
+
+def _prefetch_headers(paths, stop_event, size=16 * 1024):
+    """Pull the first `size` bytes of each file into the OS page cache until stopped"""
+    fadvise = getattr(os, 'posix_fadvise', None)
+    for path in paths:
+        if stop_event.is_set():
+            return
+        try:
+            if fadvise:
+                fd = os.open(path, os.O_RDONLY)
+                try:
+                    fadvise(fd, 0, size, os.POSIX_FADV_WILLNEED)
+                finally:
+                    os.close(fd)
+            else:
+                with open(path, 'rb') as f:
+                    f.read(size)
+        except OSError:
+            pass
+
+
+@dataclass
+class CheckpointSortConfig:
+    """Options collected for one checkpoint sorting run"""
+    output_dir: str
+    move_files: bool = False
+    create_metadata: bool = True
+    rename_files: bool = False
+    user_prefix: str = ""
+    group_by_lora_stack: bool = False
+
 
 class SorterV2:
     """Main interface for Sorter 2.0"""
     
     def __init__(self):
         self.logger = SortLogger()
+        self.logger.set_progress_callback(_make_progress())
+        self.metadata_cache = None  # loaded on first metadata-based operation
         print("🚀 Sorter 2.0 - Advanced ComfyUI Image Organizer")
         print("=" * 60)
     
     def main_menu(self):
         """Display main menu and handle user choices"""
+        # Menu keys -> handlers, looked up once per choice
+        actions = {
+            "1": self.sort_by_checkpoint,
+            "2": self.search_and_sort,
+            "3": self.sort_by_color,
+            "4": self.flatten_images,
+            "5": self.view_session_logs,
+        }
+        
         while True:
-            print("\n📋 SORTING OPTIONS:")
-            print("1. 🎯 Sort by Base Checkpoint (Most Used)")
-            print("2. 🔍 Search & Sort by Metadata")
-            print("3. 🌈 Sort by Color")
-            print("4. 📂 Flatten Image Folders")
-            print("5. 📊 View Previous Session Logs")
-            print("0. ❌ Exit")
+            sys.stdout.write(MENU)
+            sys.stdout.flush()
             
-            choice = input("\nChoose option (0-5): ").strip()
+            choice = _ask("\nChoose option (0-5): ").strip()
             
-            if choice == "1":
-                self.sort_by_checkpoint()
-            elif choice == "2":
-                self.search_and_sort()
-            elif choice == "3":
-                self.sort_by_color()
-            elif choice == "4":
-                self.flatten_images()
-            elif choice == "5":
-                self.view_session_logs()
+            action = actions.get(choice)
+            if action:
+                action()
             elif choice == "0":
                 print("👋 Goodbye!")
                 break
@@ -86,77 +214,46 @@ class SorterV2:
         if not source_dir:
             return
         
-        # Count PNG files
-        png_count = len([f for f in os.listdir(source_dir) if f.lower().endswith('.png')])
+        # Count PNG files, keeping the list for the sorter
+        png_files = _list_pngs(source_dir)
+        png_count = len(png_files)
         if png_count == 0:
             print("❌ No PNG files found in source directory")
             return
         
         print(f"📊 Found {png_count} PNG files to sort")
         
-        # Get output directory
-        output_dir = input("Enter output directory (or press Enter for 'sorted'): ").strip().strip('"\'')
-        if not output_dir:
-            output_dir = os.path.join(source_dir, "sorted")
-        
-        # Operation type
-        move_files = input("Move files? (y/n, default=n): ").lower() == 'y'
-        operation = "MOVE" if move_files else "COPY"
-        
-        # Create metadata files
-        create_metadata = input("Create metadata files? (y/n, default=y): ").lower() != 'n'
-        
-        # Renaming options
-        rename_files = input("Rename files with sequential numbering? (y/n, default=n): ").lower() == 'y'
-        user_prefix = ""
-        if rename_files:
-            user_prefix = input("Enter prefix for renamed files (e.g. 'nova_skyrift'): ").strip()
-            if not user_prefix:
-                print("❌ Prefix is required for renaming")
-                rename_files = False
-        
-        # Advanced grouping options
-        print("\n🎯 GROUPING OPTIONS:")
-        print("1. By checkpoint only (default)")
-        print("2. By checkpoint + LoRA stack combination")
-        
-        grouping_choice = input("Choose grouping method (1-2, default=1): ").strip()
-        group_by_lora_stack = grouping_choice == "2"
-        
-        if group_by_lora_stack:
-            print("📝 Note: Images will be grouped by both checkpoint AND LoRA combinations")
-        
-        # Confirm before starting
-        print(f"\n📋 CONFIRMATION:")
-        print(f"   Source: {source_dir}")
-        print(f"   Output: {output_dir}")
-        print(f"   Files: {png_count} PNG files")
-        print(f"   Operation: {operation}")
-        print(f"   Metadata files: {'Yes' if create_metadata else 'No'}")
-        print(f"   Grouping: {'Checkpoint + LoRA Stack' if group_by_lora_stack else 'Checkpoint Only'}")
-        print(f"   Rename files: {'Yes' if rename_files else 'No'}")
-        if rename_files and user_prefix:
-            print(f"   Naming pattern: {user_prefix}_img1, {user_prefix}_img2, etc.")
-        
-        confirm = input("\nProceed? (y/n): ").lower()
-        if confirm != 'y':
-            print("❌ Operation cancelled")
+        # Warm the page cache with the files' headers while the user answers prompts
+        stop_prefetch = threading.Event()
+        prefetch = threading.Thread(target=_prefetch_headers, args=(png_files, stop_prefetch), daemon=True)
+        prefetch.start()
+        try:
+            config = self._gather_checkpoint_config(source_dir, png_count)
+        finally:
+            stop_prefetch.set()
+            prefetch.join()
+        if config is None:
             return
         
         # Start sorting
         try:
-            sorter = CheckpointSorter(self.logger)
+            from sorters.checkpoint_sorter import CheckpointSorter
+            sorter = CheckpointSorter(self.logger, metadata_cache=self._get_metadata_cache())
             
             print(f"\n🚀 Starting checkpoint sorting...")
+            # The sorter spreads metadata extraction over processes itself
+            # once the batch is big enough to pay for the pool
             results = sorter.sort_by_checkpoint(
                 source_dir=source_dir,
-                output_dir=output_dir,
-                move_files=move_files,
-                create_metadata_files=create_metadata,
-                rename_files=rename_files,
-                user_prefix=user_prefix,
-                group_by_lora_stack=group_by_lora_stack
+                output_dir=config.output_dir,
+                move_files=config.move_files,
+                create_metadata_files=config.create_metadata,
+                rename_files=config.rename_files,
+                user_prefix=config.user_prefix,
+                group_by_lora_stack=config.group_by_lora_stack,
+                files=png_files
             )
+            self.metadata_cache.save()
             
             # Show results
             stats = results['sorter_stats']
@@ -166,13 +263,88 @@ class SorterV2:
             print(f"   Unknown checkpoints: {stats['unknown_checkpoint']}")
             
             # Offer to open output folder
-            if input("\nOpen output folder? (y/n): ").lower() == 'y':
-                os.startfile(output_dir)
+            self._offer_open_folder(config.output_dir)
                 
         except Exception as e:
             print(f"❌ Error during sorting: {e}")
             self.logger.log_error(f"Checkpoint sorting failed: {str(e)}", source_dir, "Sorting Error")
     
+    def _gather_checkpoint_config(self, source_dir: str, png_count: int) -> Optional[CheckpointSortConfig]:
+        """Prompt for and confirm checkpoint sorting options; None if cancelled"""
+        # Gather options; declining the confirmation offers to edit them
+        # with the previous answers as defaults instead of starting over
+        config = None
+        while True:
+            config = self._prompt_checkpoint_config(source_dir, config)
+            
+            # Confirm before starting
+            summary = [
+                f"\n📋 CONFIRMATION:",
+                f"   Source: {source_dir}",
+                f"   Output: {config.output_dir}",
+                f"   Files: {png_count} PNG files",
+                f"   Operation: {'MOVE' if config.move_files else 'COPY'}",
+                f"   Metadata files: {'Yes' if config.create_metadata else 'No'}",
+                f"   Grouping: {'Checkpoint + LoRA Stack' if config.group_by_lora_stack else 'Checkpoint Only'}",
+                f"   Rename files: {'Yes' if config.rename_files else 'No'}",
+            ]
+            if config.rename_files and config.user_prefix:
+                summary.append(f"   Naming pattern: {config.user_prefix}_img1, {config.user_prefix}_img2, etc.")
+            
+            if self._confirm(summary):
+                return config
+            if _ask("Edit settings? (y/n): ").lower() != 'y':
+                print("❌ Operation cancelled")
+                return None
+    
+    def _prompt_checkpoint_config(self, source_dir: str,
+                                  previous: Optional[CheckpointSortConfig] = None) -> CheckpointSortConfig:
+        """Ask for checkpoint sorting options; Enter keeps the value from `previous`"""
+        config = previous or CheckpointSortConfig(output_dir=os.path.join(source_dir, "sorted"))
+        
+        # Get output directory
+        default_name = "'sorted'" if previous is None else f"'{config.output_dir}'"
+        config.output_dir = self._ask_output_dir(default_name, config.output_dir)
+        
+        # Operation type
+        config.move_files = self._ask_yes_no("Move files?", config.move_files)
+        
+        # Create metadata files
+        config.create_metadata = self._ask_yes_no("Create metadata files?", config.create_metadata)
+        
+        # Renaming options
+        config.rename_files = self._ask_yes_no("Rename files with sequential numbering?", config.rename_files)
+        if config.rename_files:
+            hint = f"default='{config.user_prefix}'" if config.user_prefix else "e.g. 'nova_skyrift'"
+            user_prefix = _ask(f"Enter prefix for renamed files ({hint}): ").strip() or config.user_prefix
+            if not user_prefix:
+                print("❌ Prefix is required for renaming")
+                config.rename_files = False
+            config.user_prefix = user_prefix
+        else:
+            config.user_prefix = ""
+        
+        # Advanced grouping options
+        print("\n🎯 GROUPING OPTIONS:")
+        print("1. By checkpoint only (default)")
+        print("2. By checkpoint + LoRA stack combination")
+        
+        default_choice = "2" if config.group_by_lora_stack else "1"
+        grouping_choice = _ask(f"Choose grouping method (1-2, default={default_choice}): ").strip() or default_choice
+        config.group_by_lora_stack = grouping_choice == "2"
+        
+        if config.group_by_lora_stack:
+            print("📝 Note: Images will be grouped by both checkpoint AND LoRA combinations")
+        
+        return config
+    
+    def _ask_yes_no(self, question: str, default: bool) -> bool:
+        """Ask a y/n question; an empty answer returns `default`"""
+        answer = _ask(f"{question} (y/n, default={'y' if default else 'n'}): ").strip().lower()
+        if not answer:
+            return default
+        return answer == 'y'
+    
     def search_and_sort(self):
         """Search and sort by metadata content"""
         print("\n🔍 SEARCH & SORT BY METADATA")
@@ -188,7 +360,7 @@ class SorterV2:
         print("2. Search for prompt keywords")
         print("3. Custom metadata search")
         
-        search_type = input("Choose search type (1-3): ").strip()
+        search_type = _ask("Choose search type (1-3): ").strip()
         
         if search_type == "1":
             self._search_for_lora(source_dir)
@@ -201,130 +373,89 @@ class SorterV2:
     
     def _search_for_lora(self, source_dir: str):
         """Search for specific LoRA"""
-        lora_name = input("Enter LoRA name to search for (e.g., 'Nova_Skyrift'): ").strip()
+        lora_name = _ask("Enter LoRA name to search for (e.g., 'Nova_Skyrift'): ").strip()
         if not lora_name:
             print("❌ LoRA name required")
             return
         
-        output_dir = input("Enter output directory (or press Enter for auto): ").strip().strip('"\'')
-        if not output_dir:
-            clean_lora = lora_name.replace(' ', '_').replace('/', '_').replace('\\', '_')
-            output_dir = os.path.join(source_dir, f"lora_{clean_lora}")
-        
-        move_files = input("Move files? (y/n, default=n): ").lower() == 'y'
+        output_dir = self._ask_output_dir("auto", os.path.join(source_dir, f"lora_{_sanitize(lora_name)}"))
+        move_files = _ask("Move files? (y/n, default=n): ").lower() == 'y'
         
         # Confirm and execute
-        png_count = len([f for f in os.listdir(source_dir) if f.lower().endswith('.png')])
-        print(f"\n📋 Searching {png_count} PNG files for LoRA: {lora_name}")
-        
-        if input("Proceed? (y/n): ").lower() == 'y':
-            try:
-                sorter = MetadataSearchSorter(self.logger)
-                results = sorter.search_specific_lora(source_dir, output_dir, lora_name, move_files)
-                
-                stats = results['search_stats']
-                print(f"\n✅ Search complete!")
-                print(f"   Found: {stats['images_matched']} matching images")
-                print(f"   Sorted: {stats['images_sorted']} images")
-                
-                if input("Open output folder? (y/n): ").lower() == 'y':
-                    os.startfile(output_dir)
-                    
-            except Exception as e:
-                print(f"❌ Search failed: {e}")
+        png_files = _list_pngs(source_dir)
+        self._run_search(
+            [f"\n📋 Searching {len(png_files)} PNG files for LoRA: {lora_name}"],
+            output_dir,
+            lambda sorter: sorter.search_specific_lora(source_dir, output_dir, lora_name, move_files,
+                                                       files=png_files)
+        )
     
     def _search_for_keywords(self, source_dir: str):
         """Search for prompt keywords"""
-        keywords_input = input("Enter keywords to search for (separated by commas): ").strip()
+        keywords_input = _ask("Enter keywords to search for (separated by commas): ").strip()
         if not keywords_input:
             print("❌ Keywords required")
             return
         
-        keywords = [k.strip() for k in keywords_input.split(',') if k.strip()]
+        keywords = _split_terms(keywords_input)
         
-        output_dir = input("Enter output directory (or press Enter for auto): ").strip().strip('"\'')
-        if not output_dir:
-            output_dir = os.path.join(source_dir, "keyword_search")
-        
-        move_files = input("Move files? (y/n, default=n): ").lower() == 'y'
-        require_all = input("Require ALL keywords? (y/n, default=n): ").lower() == 'y'
+        output_dir = self._ask_output_dir("auto", os.path.join(source_dir, "keyword_search"))
+        move_files = _ask("Move files? (y/n, default=n): ").lower() == 'y'
+        require_all = _ask("Require ALL keywords? (y/n, default=n): ").lower() == 'y'
         
         # Confirm and execute
-        png_count = len([f for f in os.listdir(source_dir) if f.lower().endswith('.png')])
+        png_files = _list_pngs(source_dir)
         logic = "AND" if require_all else "OR"
-        print(f"\n📋 Searching {png_count} PNG files for keywords: {keywords} ({logic} logic)")
-        
-        if input("Proceed? (y/n): ").lower() == 'y':
-            try:
-                sorter = MetadataSearchSorter(self.logger)
-                results = sorter.search_by_prompt_keywords(source_dir, output_dir, keywords, move_files, require_all)
-                
-                stats = results['search_stats']
-                print(f"\n✅ Search complete!")
-                print(f"   Found: {stats['images_matched']} matching images")
-                print(f"   Sorted: {stats['images_sorted']} images")
-                
-                if input("Open output folder? (y/n): ").lower() == 'y':
-                    os.startfile(output_dir)
-                    
-            except Exception as e:
-                print(f"❌ Search failed: {e}")
+        self._run_search(
+            [f"\n📋 Searching {len(png_files)} PNG files for keywords: {keywords} ({logic} logic)"],
+            output_dir,
+            lambda sorter: sorter.search_by_prompt_keywords(source_dir, output_dir, keywords, move_files,
+                                                            require_all, files=png_files)
+        )
     
     def _custom_search(self, source_dir: str):
         """Custom metadata search"""
-        search_terms_input = input("Enter search terms (separated by commas): ").strip()
+        search_terms_input = _ask("Enter search terms (separated by commas): ").strip()
         if not search_terms_input:
             print("❌ Search terms required")
             return
         
-        search_terms = [t.strip() for t in search_terms_input.split(',') if t.strip()]
+        search_terms = _split_terms(search_terms_input)
         
         print("\nSearch mode:")
         print("1. ANY term matches (OR logic)")
         print("2. ALL terms must match (AND logic)")
         print("3. Exact match")
         
-        mode_choice = input("Choose mode (1-3, default=1): ").strip() or "1"
+        mode_choice = _ask("Choose mode (1-3, default=1): ").strip() or "1"
         search_modes = {"1": "any", "2": "all", "3": "exact"}
         search_mode = search_modes.get(mode_choice, "any")
         
-        output_dir = input("Enter output directory (or press Enter for auto): ").strip().strip('"\'')
-        if not output_dir:
-            output_dir = os.path.join(source_dir, "custom_search")
-        
-        move_files = input("Move files? (y/n, default=n): ").lower() == 'y'
-        case_sensitive = input("Case sensitive search? (y/n, default=n): ").lower() == 'y'
+        output_dir = self._ask_output_dir("auto", os.path.join(source_dir, "custom_search"))
+        move_files = _ask("Move files? (y/n, default=n): ").lower() == 'y'
+        case_sensitive = _ask("Case sensitive search? (y/n, default=n): ").lower() == 'y'
         
         # Confirm and execute
-        png_count = len([f for f in os.listdir(source_dir) if f.lower().endswith('.png')])
-        print(f"\n📋 Custom search configuration:")
-        print(f"   Files: {png_count} PNG files")
-        print(f"   Terms: {search_terms}")
-        print(f"   Mode: {search_mode.upper()}")
-        print(f"   Case sensitive: {case_sensitive}")
-        
-        if input("Proceed? (y/n): ").lower() == 'y':
-            try:
-                sorter = MetadataSearchSorter(self.logger)
-                results = sorter.search_and_sort(
-                    source_dir=source_dir,
-                    output_dir=output_dir,
-                    search_terms=search_terms,
-                    search_mode=search_mode,
-                    move_files=move_files,
-                    case_sensitive=case_sensitive
-                )
-                
-                stats = results['search_stats']
-                print(f"\n✅ Search complete!")
-                print(f"   Found: {stats['images_matched']} matching images")
-                print(f"   Sorted: {stats['images_sorted']} images")
-                
-                if input("Open output folder? (y/n): ").lower() == 'y':
-                    os.startfile(output_dir)
-                    
-            except Exception as e:
-                print(f"❌ Search failed: {e}")
+        png_files = _list_pngs(source_dir)
+        self._run_search(
+            [
+                f"\n📋 Custom search configuration:",
+                f"   Files: {len(png_files)} PNG files",
+                f"   Terms: {search_terms}",
+                f"   Mode: {search_mode.upper()}",
+                f"   Case sensitive: {case_sensitive}",
+            ],
+            output_dir,
+            lambda sorter: sorter.search_and_sort(
+                source_dir=source_dir,
+                output_dir=output_dir,
+                search_terms=search_terms,
+                search_mode=search_mode,
+                move_files=move_files,
+                case_sensitive=case_sensitive,
+                files=png_files
+            )
+        )
     
     def sort_by_color(self):
         """Sort images by dominant color"""
@@ -336,14 +467,7 @@ class SorterV2:
             return
         
         # Count images first
-        from pathlib import Path
-        source_path = Path(source_dir)
-        image_extensions = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.webp'}
-        image_files = []
-        
-        for ext in image_extensions:
-            image_files.extend(source_path.glob(f'*{ext}'))
-            image_files.extend(source_path.glob(f'*{ext.upper()}'))
+        image_files = _list_images(source_dir)
         
         print(f"📊 Found {len(image_files)} image files to sort")
         
@@ -351,20 +475,18 @@ class SorterV2:
             print("❌ No image files found")
             return
         
-        output_dir = input("Enter output directory (or press Enter for 'color_sorted'): ").strip().strip('"\'')
-        if not output_dir:
-            output_dir = os.path.join(source_dir, "color_sorted")
+        output_dir = self._ask_output_dir("'color_sorted'", os.path.join(source_dir, "color_sorted"))
         
-        move_files = input("Move files? (y/n, default=n): ").strip().lower() == 'y'
-        create_metadata = input("Create metadata files? (y/n, default=y): ").strip().lower() != 'n'
+        move_files = _ask("Move files? (y/n, default=n): ").strip().lower() == 'y'
+        create_metadata = _ask("Create metadata files? (y/n, default=y): ").strip().lower() != 'n'
         
         # Renaming options
-        rename_files = input("Rename files with sequential numbering? (y/n, default=n): ").strip().lower() == 'y'
+        rename_files = _ask("Rename files with sequential numbering? (y/n, default=n): ").strip().lower() == 'y'
         user_prefix = ""
         if rename_files:
-            user_prefix = input("Enter filename prefix (optional, e.g. 'myproject'): ").strip()
+            user_prefix = _ask("Enter filename prefix (optional, e.g. 'myproject'): ").strip()
         
-        dark_threshold = input("Dark pixel threshold (0.0-1.0, default=0.1): ").strip()
+        dark_threshold = _ask("Dark pixel threshold (0.0-1.0, default=0.1): ").strip()
         try:
             dark_threshold = float(dark_threshold) if dark_threshold else 0.1
             dark_threshold = max(0.0, min(1.0, dark_threshold))
@@ -372,27 +494,30 @@ class SorterV2:
             dark_threshold = 0.1
         
         # Confirmation
-        print(f"\n📋 CONFIRMATION:")
-        print(f"   Source: {source_dir}")
-        print(f"   Output: {output_dir}")
-        print(f"   Files: {len(image_files)} image files")
-        print(f"   Operation: {'MOVE' if move_files else 'COPY'}")
-        print(f"   Metadata files: {'Yes' if create_metadata else 'No'}")
-        print(f"   Rename files: {'Yes' if rename_files else 'No'}")
+        summary = [
+            f"\n📋 CONFIRMATION:",
+            f"   Source: {source_dir}",
+            f"   Output: {output_dir}",
+            f"   Files: {len(image_files)} image files",
+            f"   Operation: {'MOVE' if move_files else 'COPY'}",
+            f"   Metadata files: {'Yes' if create_metadata else 'No'}",
+            f"   Rename files: {'Yes' if rename_files else 'No'}",
+        ]
         if rename_files:
             if user_prefix:
-                print(f"   Prefix: '{user_prefix}' (e.g. {user_prefix}_red_img1.png)")
+                summary.append(f"   Prefix: '{user_prefix}' (e.g. {user_prefix}_red_img1.png)")
             else:
-                print(f"   Naming: color_img# format (e.g. red_img1.png)")
-        print(f"   Dark threshold: {dark_threshold}")
+                summary.append(f"   Naming: color_img# format (e.g. red_img1.png)")
+        summary.append(f"   Dark threshold: {dark_threshold}")
         
-        if input("\nProceed? (y/n): ").strip().lower() != 'y':
+        if not self._confirm(summary):
             print("❌ Operation cancelled")
             return
         
         # Execute color sorting
         print("🚀 Starting color sorting...")
         
+        from sorters.color_sorter import ColorSorter
         color_sorter = ColorSorter(self.logger)
         success = color_sorter.sort_by_color(
             source_dir=source_dir,
@@ -401,14 +526,13 @@ class SorterV2:
             create_metadata=create_metadata,
             ignore_dark_threshold=dark_threshold,
             rename_files=rename_files,
-            user_prefix=user_prefix
+            user_prefix=user_prefix,
+            files=image_files
         )
         
         if success:
             print("✅ COLOR SORTING COMPLETE!")
-            if input("\nOpen output folder? (y/n): ").strip().lower() == 'y':
-                import subprocess
-                subprocess.run(['explorer', os.path.abspath(output_dir)], shell=True)
+            self._offer_open_folder(output_dir)
         else:
             print("❌ Color sorting failed")
     
@@ -422,6 +546,7 @@ class SorterV2:
             return
         
         # Preview first
+        from sorters.image_flattener import ImageFlattener
         flattener = ImageFlattener(self.logger)
         preview_data = flattener.preview_flatten(source_dir)
         
@@ -430,24 +555,22 @@ class SorterV2:
             return
         
         print(f"\n🤔 Continue with flattening?")
-        target_dir = input("Enter target directory (or press Enter for 'flattened'): ").strip().strip('"\'')
-        if not target_dir:
-            target_dir = os.path.join(source_dir, "flattened")
+        target_dir = self._ask_output_dir("'flattened'", os.path.join(source_dir, "flattened"), "target")
         
-        move_files = input("Move files? (y/n, default=n): ").strip().lower() == 'y'
-        remove_empty = input("Remove empty directories? (y/n, default=y): ").strip().lower() != 'n'
+        move_files = _ask("Move files? (y/n, default=n): ").strip().lower() == 'y'
+        remove_empty = _ask("Remove empty directories? (y/n, default=y): ").strip().lower() != 'n'
         
         # Confirmation
-        print(f"\n📋 CONFIRMATION:")
-        print(f"   Source: {source_dir}")
-        print(f"   Target: {target_dir}")
-        print(f"   Images: {preview_data['total_images']} files")
-        print(f"   Folders: {preview_data['folders']} folders")
-        print(f"   Operation: {'MOVE' if move_files else 'COPY'}")
-        print(f"   Remove empty dirs: {'Yes' if remove_empty else 'No'}")
-        print(f"   Duplicates to rename: {preview_data['duplicates']}")
-        
-        if input("\nProceed? (y/n): ").strip().lower() != 'y':
+        if not self._confirm([
+            f"\n📋 CONFIRMATION:",
+            f"   Source: {source_dir}",
+            f"   Target: {target_dir}",
+            f"   Images: {preview_data['total_images']} files",
+            f"   Folders: {preview_data['folders']} folders",
+            f"   Operation: {'MOVE' if move_files else 'COPY'}",
+            f"   Remove empty dirs: {'Yes' if remove_empty else 'No'}",
+            f"   Duplicates to rename: {preview_data['duplicates']}",
+        ]):
             print("❌ Operation cancelled")
             return
         
@@ -463,9 +586,7 @@ class SorterV2:
         
         if success:
             print("✅ IMAGE FLATTENING COMPLETE!")
-            if input("\nOpen target folder? (y/n): ").strip().lower() == 'y':
-                import subprocess
-                subprocess.run(['explorer', os.path.abspath(target_dir)], shell=True)
+            self._offer_open_folder(target_dir, "target")
         else:
             print("❌ Image flattening failed")
     
@@ -479,46 +600,105 @@ class SorterV2:
             print("❌ No logs directory found")
             return
         
-        log_files = [f for f in os.listdir(logs_dir) if f.startswith('sort_') and f.endswith('.log')]
+        with os.scandir(logs_dir) as entries:
+            log_files = [entry.name for entry in entries
+                         if entry.name.startswith('sort_') and entry.name.endswith('.log')]
         
         if not log_files:
             print("❌ No log files found")
             return
         
+        # Sort once so the listing and the selection always agree
+        recent_logs = sorted(log_files, reverse=True)[:5]
+        
         print(f"📋 Found {len(log_files)} log files:")
-        for i, log_file in enumerate(sorted(log_files, reverse=True)[:5]):
+        for i, log_file in enumerate(recent_logs):
             print(f"   {i+1}. {log_file}")
         
-        choice = input("Enter number to view log (or press Enter to skip): ").strip()
+        choice = _ask("Enter number to view log (or press Enter to skip): ").strip()
         
         try:
             index = int(choice) - 1
-            if 0 <= index < len(log_files):
-                log_path = os.path.join(logs_dir, sorted(log_files, reverse=True)[index])
-                print(f"\n📄 Viewing: {log_files[index]}")
+            if 0 <= index < len(recent_logs):
+                log_path = os.path.join(logs_dir, recent_logs[index])
+                print(f"\n📄 Viewing: {recent_logs[index]}")
                 print("-" * 60)
                 
-                with open(log_path, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                    # Show last 50 lines
-                    for line in lines[-50:]:
-                        print(line.rstrip())
+                # Show last 50 lines, once queued log lines are on disk
+                flush_logs()
+                for line in _tail_lines(log_path, 50):
+                    print(line.rstrip())
         except (ValueError, IndexError):
             print("❌ Invalid selection")
     
+    def _get_metadata_cache(self):
+        """Load the extracted-metadata cache kept next to the session logs"""
+        if self.metadata_cache is None:
+            from core.metadata_engine import MetadataCache
+            self.metadata_cache = MetadataCache(os.path.join(self.logger.logs_path, ".metadata_cache.json"))
+        return self.metadata_cache
+    
+    def _ask_output_dir(self, default_name: str, default_dir: str, kind: str = "output") -> str:
+        """Prompt for an output directory, falling back to `default_dir` on Enter"""
+        directory = _ask(f"Enter {kind} directory (or press Enter for {default_name}): ").strip().strip('"\'')
+        return directory or default_dir
+    
+    def _confirm(self, summary: List[str]) -> bool:
+        """Print a confirmation summary in one write and ask to proceed"""
+        print("\n".join(summary))
+        return _ask("\nProceed? (y/n): ").strip().lower() == 'y'
+    
+    def _offer_open_folder(self, path: str, kind: str = "output"):
+        """Ask whether to open a result folder"""
+        if _ask(f"\nOpen {kind} folder? (y/n): ").strip().lower() == 'y':
+            self._open_folder(path)
+    
+    def _run_search(self, summary: List[str], output_dir: str, run: Callable):
+        """Confirm a metadata search, run it with a fresh sorter and report the results"""
+        if not self._confirm(summary):
+            return
+        
+        try:
+            from sorters.metadata_search import MetadataSearchSorter
+            results = run(MetadataSearchSorter(self.logger, metadata_cache=self._get_metadata_cache()))
+            self.metadata_cache.save()
+            
+            stats = results['search_stats']
+            print(f"\n✅ Search complete!")
+            print(f"   Found: {stats['images_matched']} matching images")
+            print(f"   Sorted: {stats['images_sorted']} images")
+            
+            self._offer_open_folder(output_dir)
+            
+        except Exception as e:
+            print(f"❌ Search failed: {e}")
+    
+    def _open_folder(self, path: str):
+        """Open a folder in the system file browser without waiting for it"""
+        path = os.path.abspath(path)
+        if sys.platform == 'win32':
+            subprocess.Popen(['explorer', path], close_fds=True)
+        elif sys.platform == 'darwin':
+            subprocess.Popen(['open', path], close_fds=True)
+        else:
+            subprocess.Popen(['xdg-open', path], close_fds=True)
+    
     def _get_directory_input(self, prompt: str) -> str:
         """Get and validate directory input from user"""
-        directory = input(f"{prompt}: ").strip().strip('"\'')
+        directory = _ask(f"{prompt}: ").strip().strip('"\'')
         
         if not directory:
             print("❌ Directory path required")
             return ""
         
-        if not os.path.exists(directory):
+        # One stat() answers both "exists" and "is a directory"
+        try:
+            st = os.stat(directory)
+        except OSError:
             print(f"❌ Directory not found: {directory}")
             return ""
         
-        if not os.path.isdir(directory):
+        if not stat.S_ISDIR(st.st_mode):
             print(f"❌ Path is not a directory: {directory}")
             return ""
         
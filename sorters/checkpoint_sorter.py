@@ -15,28 +15,139 @@ Features:
 
 import os
 import shutil
-import json
 import sys
+import queue
+from collections import defaultdict
+from functools import lru_cache
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Tuple, Optional, Any
 from pathlib import Path
 import re
 
+try:
+    import fcntl  # POSIX only; used for reflink clones
+except ImportError:
+    fcntl = None
+
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.metadata_engine import MetadataExtractor, MetadataAnalyzer
+from core.metadata_engine import MetadataExtractor, MetadataAnalyzer, MetadataCache
 from core.enhanced_metadata_formatter import EnhancedMetadataFormatter
 from core.diagnostics import SortLogger
+from core.file_ops import move_file, transfer_pool, finish_transfers, safe_folder_name, name_key, DestinationNames
+
+# Below this many files a process pool costs more to start than it saves
+PROCESS_POOL_MIN_FILES = 100
+
+# Extracted files waiting for the mover thread in the streaming pipeline
+PIPELINE_QUEUE_SIZE = 256
+
+# Formatted metadata sidecars waiting for the writer thread
+METADATA_WRITE_QUEUE_SIZE = 1024
+
+# Open directory fds kept per run for relative renames; past this many
+# distinct folders, moves go back to full paths
+MAX_DIR_FDS = 256
+
+# Whether os.replace can resolve names relative to directory fds here
+_RENAME_DIR_FD = os.rename in os.supports_dir_fd
+
+# FICLONE ioctl (linux/fs.h): share the source's extents instead of copying
+_FICLONE = 0x40049409
+
+# Kernel-side copy methods to try on Linux, fastest first
+_KERNEL_COPY_METHODS = ()
+if sys.platform.startswith('linux'):
+    _KERNEL_COPY_METHODS = tuple(
+        method for method, available in (
+            ('clone', fcntl is not None),
+            ('copy_file_range', hasattr(os, 'copy_file_range')),
+            ('sendfile', hasattr(os, 'sendfile')),
+        ) if available
+    )
+
+
+def _copy_fd_range(method: str, src_fd: int, dst_fd: int):
+    """Copy a whole file between open fds with one kernel-side method"""
+    if method == 'clone':
+        fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+        return
+    offset = 0
+    while True:
+        if method == 'copy_file_range':
+            sent = os.copy_file_range(src_fd, dst_fd, 1 << 30, offset, offset)
+        else:
+            sent = os.sendfile(dst_fd, src_fd, offset, 1 << 30)
+        if not sent:
+            break
+        offset += sent
+
+
+def _fast_copy(src: str, dst: str, method: Optional[str] = None) -> str:
+    """
+    copy2 equivalent that keeps the data in the kernel where it can: on
+    Linux a reflink clone, then copy_file_range, then sendfile, else a 1 MiB
+    buffered copy; timestamps/mode are copied afterwards. Other platforms
+    use shutil.copy2, which already has a native fast path there.
+    Returns the method that worked so the caller can start there next time.
+    """
+    if not _KERNEL_COPY_METHODS:
+        shutil.copy2(src, dst)
+        return 'copy2'
+    
+    if method != 'buffered':
+        start = _KERNEL_COPY_METHODS.index(method) if method in _KERNEL_COPY_METHODS else 0
+        src_fd = os.open(src, os.O_RDONLY)
+        try:
+            for candidate in _KERNEL_COPY_METHODS[start:]:
+                # Reopened with O_TRUNC so a method that fails midway leaves nothing behind
+                dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+                try:
+                    _copy_fd_range(candidate, src_fd, dst_fd)
+                except OSError:
+                    continue  # not supported on this filesystem pair
+                finally:
+                    os.close(dst_fd)
+                shutil.copystat(src, dst)
+                return candidate
+        finally:
+            os.close(src_fd)
+    
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        shutil.copyfileobj(fsrc, fdst, 1 << 20)
+    shutil.copystat(src, dst)
+    return 'buffered'
+
+
+@lru_cache(maxsize=4096)
+def _clean_checkpoint_name(checkpoint_path: str) -> str:
+    """
+    Turn a checkpoint path into a folder name: drop the directory and
+    extension, replace unsafe characters and cap the length at 50.
+    Cached because a batch usually has only a handful of distinct checkpoints.
+    """
+    return safe_folder_name(Path(checkpoint_path).stem)[:50]
+
 
 class CheckpointSorter:
     """Sort images by their base checkpoint/model"""
     
-    def __init__(self, logger: Optional[SortLogger] = None):
-        self.metadata_extractor = MetadataExtractor()
+    def __init__(self, logger: Optional[SortLogger] = None, metadata_cache: Optional[MetadataCache] = None):
+        self.metadata_extractor = MetadataExtractor(cache=metadata_cache)
         self.metadata_analyzer = MetadataAnalyzer()
-        self.metadata_formatter = EnhancedMetadataFormatter()
+        self.metadata_formatter = EnhancedMetadataFormatter(checkpoint_lookup=self._primary_checkpoint)
         self.logger = logger or SortLogger()
         
+        # Primary checkpoint per metadata dict for the current run, keyed by id();
+        # grouping, folder naming and sidecar text all ask for it
+        self._checkpoint_memo = {}
+        
+        # Filename regex for this run and the checkpoints it matched, by file path
+        self._name_pattern = None
+        self._named_checkpoints = {}
+        
         # Statistics
         self.stats = {
             'total_images': 0,
@@ -49,6 +160,22 @@ class CheckpointSorter:
         
         # Folder mapping for organization
         self.checkpoint_folders = {}
+        
+        # Destination folders already created this run, and whether moves can
+        # be plain renames (source and output on the same filesystem)
+        self._made_dirs = set()
+        self._output_subdirs = None
+        self._same_device = False
+        self._copy_method = None  # probed on the first copy of each run
+        self._dir_fds = {}
+        
+        # Filenames present in each destination folder, scanned once per run
+        # and kept current as files are added
+        self._dest_names = DestinationNames()
+        
+        # Background sidecar writer, running only while files are being sorted
+        self._write_q = None
+        self._writer_thread = None
     
     def sort_by_checkpoint(
         self, 
@@ -59,7 +186,10 @@ class CheckpointSorter:
         preserve_structure: bool = False,
         rename_files: bool = False,
         user_prefix: str = "",
-        group_by_lora_stack: bool = False
+        group_by_lora_stack: bool = False,
+        files: Optional[List[str]] = None,
+        executor=None,
+        filename_pattern: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Sort images by base checkpoint into organized folders
@@ -73,18 +203,30 @@ class CheckpointSorter:
             rename_files: True to rename files with sequential numbering
             user_prefix: Custom prefix for renamed files (e.g. "nova_skyrift")
             group_by_lora_stack: Also group by LoRA combination within checkpoint folders
+            files: Pre-collected PNG paths under source_dir (None = scan the directory)
+            executor: Optional executor (e.g. a ProcessPoolExecutor) for metadata extraction;
+                file moves and copies stay on the calling thread
+            filename_pattern: Optional regex matched against each filename; on a match
+                its first group (or the whole match) is taken as the checkpoint and the
+                file's metadata is never read, so it gets no metadata sidecar
             
         Returns:
             Dictionary with sorting results and statistics
         """
         
         self.logger.start_operation("Checkpoint Sorting")
+        self._checkpoint_memo.clear()
+        self._named_checkpoints.clear()
+        self._name_pattern = re.compile(filename_pattern) if filename_pattern else None
         self.logger._write_log(f"Source: {source_dir}")
         self.logger._write_log(f"Output: {output_dir}")
         self.logger._write_log(f"Operation: {'MOVE' if move_files else 'COPY'}")
         
-        # Find all PNG files
-        png_files = self._find_png_files(source_dir, preserve_structure)
+        # Find all PNG files, unless the caller already listed them
+        if files is not None:
+            png_files = self._files_with_rel_paths(files, source_dir, preserve_structure)
+        else:
+            png_files = self._find_png_files(source_dir, preserve_structure)
         self.stats['total_images'] = len(png_files)
         
         if not png_files:
@@ -95,10 +237,43 @@ class CheckpointSorter:
         
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
+        self.checkpoint_folders.clear()
+        self._made_dirs.clear()
+        self._output_subdirs = None
+        self._dest_names.clear()
+        self._same_device = os.stat(source_dir).st_dev == os.stat(output_dir).st_dev
+        self._copy_method = None
+        
+        # Checkpoint grouping (LoRA-stack mode included, since its folders are
+        # named by checkpoint alone) needs no whole-batch view, so files are
+        # moved/copied while later ones are still being parsed. Sequential
+        # renaming numbers files across the complete grouping, so it keeps
+        # the phased flow.
+        if not rename_files:
+            self.logger.start_operation("Metadata Extraction & File Sorting", len(png_files))
+            if create_metadata_files:
+                self._start_metadata_writer()
+            try:
+                self._extract_and_sort_streaming(
+                    png_files, output_dir, move_files, create_metadata_files, executor
+                )
+            except Exception as e:
+                self.logger._write_log(f"ERROR in file sorting: {str(e)}")
+                import traceback
+                self.logger._write_log(f"Traceback: {traceback.format_exc()}")
+            finally:
+                self._stop_metadata_writer()
+            self.logger.complete_operation()
+            self._checkpoint_memo.clear()
+            self._close_dir_fds()
+            
+            results = self._get_results()
+            self._log_summary(results)
+            return results
         
         # Phase 1: Extract all metadata (with progress tracking)
         self.logger.start_operation("Metadata Extraction", len(png_files))
-        metadata_results = self._extract_all_metadata(png_files)
+        metadata_results = self._extract_all_metadata(png_files, executor)
         self.logger.complete_operation()
         
         # Phase 2: Analyze and group by checkpoint (and optionally LoRA stack)
@@ -116,6 +291,8 @@ class CheckpointSorter:
         
         # Phase 4: Sort files into folders
         self.logger.start_operation("File Sorting", len(png_files))
+        if create_metadata_files:
+            self._start_metadata_writer()
         try:
             self._sort_files_to_folders(
                 png_files, metadata_results, checkpoint_groups, 
@@ -126,7 +303,11 @@ class CheckpointSorter:
             self.logger._write_log(f"ERROR in file sorting: {str(e)}")
             import traceback
             self.logger._write_log(f"Traceback: {traceback.format_exc()}")
+        finally:
+            self._stop_metadata_writer()
         self.logger.complete_operation()
+        self._checkpoint_memo.clear()
+        self._close_dir_fds()
         
         # Generate summary
         results = self._get_results()
@@ -138,31 +319,145 @@ class CheckpointSorter:
         """Find all PNG files, optionally preserving subfolder structure"""
         png_files = []
         
-        if preserve_structure:
-            # Recursively find files, preserving relative paths
-            for root, dirs, files in os.walk(source_dir):
-                for file in files:
-                    if file.lower().endswith('.png'):
-                        full_path = os.path.join(root, file)
-                        rel_path = os.path.relpath(root, source_dir)
-                        png_files.append((full_path, rel_path if rel_path != '.' else ''))
-        else:
-            # Just the source directory
-            for file in os.listdir(source_dir):
-                if file.lower().endswith('.png'):
-                    full_path = os.path.join(source_dir, file)
-                    png_files.append((full_path, ''))
+        # Explicit stack over scandir; DirEntry type checks come from the
+        # cached dirent, so only the walk's readdir calls hit the disk.
+        # Subfolders are only descended into when preserving structure.
+        stack = [(source_dir, '')]
+        while stack:
+            directory, rel_path = stack.pop()
+            subdirs = []
+            
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        # Like os.walk, don't descend into symlinked dirs
+                        if preserve_structure and not entry.is_symlink():
+                            subdirs.append((entry.path, os.path.join(rel_path, entry.name) if rel_path else entry.name))
+                    elif entry.name.lower().endswith('.png'):
+                        png_files.append((entry.path, rel_path))
+            
+            # Reversed so folders are visited in the same top-down order as os.walk
+            stack.extend(reversed(subdirs))
+        
+        return png_files
+    
+    def _files_with_rel_paths(self, files: List[str], source_dir: str, preserve_structure: bool) -> List[Tuple[str, str]]:
+        """Pair caller-supplied paths with their subfolder, as _find_png_files does"""
+        png_files = []
+        
+        for full_path in files:
+            rel_path = ''
+            if preserve_structure:
+                rel_path = os.path.relpath(os.path.dirname(full_path), source_dir)
+            png_files.append((full_path, rel_path if rel_path != '.' else ''))
         
         return png_files
     
-    def _extract_all_metadata(self, png_files: List[Tuple[str, str]]) -> Dict[str, Optional[Dict]]:
+    def _extract_and_sort_streaming(
+        self,
+        png_files: List[Tuple[str, str]],
+        output_dir: str,
+        move_files: bool,
+        create_metadata_files: bool,
+        executor=None
+    ) -> Dict[str, int]:
+        """
+        Extract metadata on this thread (or its pool) while a mover thread
+        sorts each file as soon as its metadata arrives. Only per-checkpoint
+        counts are kept; each metadata dict is dropped once its file is sorted
+        """
+        rel_paths = dict(png_files)
+        work = queue.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        checkpoint_counts = {}
+        
+        def mover():
+            while True:
+                item = work.get()
+                if item is None:
+                    return
+                file_path, metadata = item
+                try:
+                    folder_name = self._classify_checkpoint(metadata, file_path)
+                    if folder_name not in self.checkpoint_folders:
+                        self._create_checkpoint_folders(output_dir, [folder_name])
+                    rel_path = rel_paths[file_path]
+                    checkpoint_counts[folder_name] = checkpoint_counts.get(folder_name, 0) + 1
+                    self._sort_one_file(
+                        file_path, rel_path, self.checkpoint_folders[folder_name],
+                        os.path.basename(file_path), metadata, move_files, create_metadata_files
+                    )
+                except Exception as e:
+                    # Keep draining so the producer never blocks on a full queue
+                    self.logger.log_error(f"Failed to sort file: {str(e)}", file_path, "File Operation")
+                finally:
+                    self._checkpoint_memo.pop(id(metadata), None)
+        
+        mover_thread = threading.Thread(target=mover, daemon=True)
+        mover_thread.start()
+        try:
+            self._extract_all_metadata(
+                png_files, executor,
+                on_result=lambda file_path, metadata: work.put((file_path, metadata)),
+                keep_results=False
+            )
+        finally:
+            work.put(None)  # poison pill
+            mover_thread.join()
+        
+        self.logger._write_log(f"Grouped into {len(checkpoint_counts)} checkpoint categories:")
+        for checkpoint, count in checkpoint_counts.items():
+            self.logger._write_log(f"  {checkpoint}: {count} files")
+        
+        return checkpoint_counts
+    
+    def _extract_all_metadata(
+        self,
+        png_files: List[Tuple[str, str]],
+        executor=None,
+        on_result=None,
+        keep_results: bool = True
+    ) -> Dict[str, Optional[Dict]]:
         """Extract metadata from all PNG files with progress tracking"""
         file_paths = [file_info[0] for file_info in png_files]
         
+        # Files whose name already gives the checkpoint skip extraction
+        if self._name_pattern is not None:
+            file_paths = self._match_checkpoint_names(file_paths, on_result)
+        
         def progress_callback(current, total, filename):
-            self.logger.update_progress(current, filename)
+            self.logger.update_progress(current, total, filename)
+        
+        # PNG decompression and JSON parsing are CPU-bound, so large batches
+        # get their own process pool unless the caller supplied an executor
+        # (default size: one worker per CPU, capped at 61 on Windows)
+        if executor is None and len(file_paths) >= PROCESS_POOL_MIN_FILES:
+            with ProcessPoolExecutor() as pool:
+                return self.metadata_extractor.extract_batch(
+                    file_paths, progress_callback, executor=pool,
+                    on_result=on_result, keep_results=keep_results
+                )
+        
+        return self.metadata_extractor.extract_batch(
+            file_paths, progress_callback, executor=executor,
+            on_result=on_result, keep_results=keep_results
+        )
+    
+    def _match_checkpoint_names(self, file_paths: List[str], on_result=None) -> List[str]:
+        """Record checkpoints named by the filename pattern; return the files still to extract"""
+        unmatched = []
+        for file_path in file_paths:
+            match = self._name_pattern.search(os.path.basename(file_path))
+            name = match and (match.group(1) if match.re.groups else match.group(0))
+            if name:
+                self._named_checkpoints[file_path] = name
+                if on_result:
+                    on_result(file_path, None)
+            else:
+                unmatched.append(file_path)
         
-        return self.metadata_extractor.extract_batch(file_paths, progress_callback)
+        if self._named_checkpoints:
+            self.logger._write_log(f"Checkpoint taken from filename for {len(self._named_checkpoints)} files")
+        return unmatched
     
     def _group_by_checkpoint(
         self, 
@@ -170,123 +465,61 @@ class CheckpointSorter:
         metadata_results: Dict[str, Optional[Dict]]
     ) -> Dict[str, List[Tuple[str, str]]]:
         """Group files by their primary checkpoint"""
-        checkpoint_groups = {}
+        checkpoint_groups = defaultdict(list)
         
         for file_path, rel_path in png_files:
-            metadata = metadata_results.get(file_path)
-            
-            if metadata:
-                # Extract primary checkpoint
-                primary_checkpoint = self.metadata_analyzer.extract_primary_checkpoint(metadata)
-                
-                if primary_checkpoint:
-                    # Clean up checkpoint name for folder naming
-                    folder_name = self._clean_checkpoint_name(primary_checkpoint)
-                    
-                    if folder_name not in checkpoint_groups:
-                        checkpoint_groups[folder_name] = []
-                    
-                    checkpoint_groups[folder_name].append((file_path, rel_path))
-                else:
-                    # No checkpoint found
-                    if 'Unknown_Checkpoint' not in checkpoint_groups:
-                        checkpoint_groups['Unknown_Checkpoint'] = []
-                    
-                    checkpoint_groups['Unknown_Checkpoint'].append((file_path, rel_path))
-                    self.stats['unknown_checkpoint'] += 1
-            else:
-                # Metadata extraction failed
-                if 'No_Metadata' not in checkpoint_groups:
-                    checkpoint_groups['No_Metadata'] = []
-                
-                checkpoint_groups['No_Metadata'].append((file_path, rel_path))
-                self.stats['failed_extractions'] += 1
+            folder_name = self._classify_checkpoint(metadata_results.get(file_path), file_path)
+            checkpoint_groups[folder_name].append((file_path, rel_path))
         
         self.logger._write_log(f"Grouped into {len(checkpoint_groups)} checkpoint categories:")
         for checkpoint, files in checkpoint_groups.items():
             self.logger._write_log(f"  {checkpoint}: {len(files)} files")
         
-        return checkpoint_groups
+        return dict(checkpoint_groups)
+    
+    def _classify_checkpoint(self, metadata: Optional[Dict], file_path: str = "") -> str:
+        """Pick the checkpoint folder for one image, counting unknown/failed cases"""
+        named = self._named_checkpoints.get(file_path)
+        if named:
+            return self._clean_checkpoint_name(named)
+        
+        if metadata:
+            # Extract primary checkpoint
+            primary_checkpoint = self._primary_checkpoint(metadata)
+            
+            if primary_checkpoint:
+                # Clean up checkpoint name for folder naming
+                return self._clean_checkpoint_name(primary_checkpoint)
+            
+            # No checkpoint found
+            self.stats['unknown_checkpoint'] += 1
+            return 'Unknown_Checkpoint'
+        
+        # Metadata extraction failed
+        self.stats['failed_extractions'] += 1
+        return 'No_Metadata'
+    
+    def _primary_checkpoint(self, metadata: Dict) -> Optional[str]:
+        """Memoized MetadataAnalyzer.extract_primary_checkpoint for this run"""
+        key = id(metadata)
+        entry = self._checkpoint_memo.get(key)
+        # Keep the dict alive alongside its result so its id() can't be reused
+        if entry is None or entry[0] is not metadata:
+            entry = (metadata, self.metadata_analyzer.extract_primary_checkpoint(metadata))
+            self._checkpoint_memo[key] = entry
+        return entry[1]
     
     def _group_by_checkpoint_and_lora(
         self, 
         png_files: List[Tuple[str, str]], 
         metadata_results: Dict[str, Optional[Dict]]
     ) -> Dict[str, List[Tuple[str, str]]]:
-        """Group files by their primary checkpoint AND LoRA stack combination (using improved algorithm)"""
-        
-        # First, create records with grouping signatures
-        records = []
-        for file_path, rel_path in png_files:
-            metadata = metadata_results.get(file_path)
-            if metadata:
-                group_signature = self.metadata_formatter.get_grouping_signature(metadata)
-            else:
-                group_signature = 'None'
-            
-            records.append({
-                'file_path': file_path,
-                'rel_path': rel_path,
-                'group': group_signature
-            })
-        
-        # Version key function (from working older version)
-        def version_key(group_name):
-            import re
-            match = re.search(r"(\d+\.\d+)", group_name)
-            return float(match.group(1)) if match else float('inf')
-        
-        # Get unique groups and sort them by version
-        unique_groups = sorted(set(record['group'] for record in records), 
-                             key=lambda g: (version_key(g), g))
-        
-        # Create generation mapping
-        gen_map = {}
-        counter = 1
-        for group in unique_groups:
-            if group == 'None':
-                gen_map[group] = 0
-            else:
-                gen_map[group] = counter
-                counter += 1
-        
-        # Group files by their signatures, but organize by checkpoint for folder structure
-        checkpoint_groups = {}
-        
-        for record in records:
-            metadata = metadata_results.get(record['file_path'])
-            
-            if metadata:
-                # Extract just the base checkpoint for folder name
-                primary_checkpoint = self.metadata_analyzer.extract_primary_checkpoint(metadata)
-                
-                if primary_checkpoint:
-                    folder_name = self._clean_checkpoint_name(primary_checkpoint)
-                    
-                    if folder_name not in checkpoint_groups:
-                        checkpoint_groups[folder_name] = []
-                    
-                    checkpoint_groups[folder_name].append((record['file_path'], record['rel_path']))
-                else:
-                    # No checkpoint found
-                    if 'Unknown_Checkpoint' not in checkpoint_groups:
-                        checkpoint_groups['Unknown_Checkpoint'] = []
-                    
-                    checkpoint_groups['Unknown_Checkpoint'].append((record['file_path'], record['rel_path']))
-                    self.stats['unknown_checkpoint'] += 1
-            else:
-                # Metadata extraction failed
-                if 'No_Metadata' not in checkpoint_groups:
-                    checkpoint_groups['No_Metadata'] = []
-                
-                checkpoint_groups['No_Metadata'].append((record['file_path'], record['rel_path']))
-                self.stats['failed_extractions'] += 1
-        
-        self.logger._write_log(f"Grouped into {len(checkpoint_groups)} checkpoint folders:")
-        for checkpoint, files in checkpoint_groups.items():
-            self.logger._write_log(f"  {checkpoint}: {len(files)} files")
-        
-        return checkpoint_groups
+        """
+        Group files for the LoRA-stack mode. Folders are still named by the
+        base checkpoint only, so this is the same single pass as
+        _group_by_checkpoint
+        """
+        return self._group_by_checkpoint(png_files, metadata_results)
     
     def _simplify_lora_signature(self, lora_signature: str) -> str:
         """Simplify LoRA signature for folder naming"""
@@ -314,30 +547,37 @@ class CheckpointSorter:
     
     def _clean_checkpoint_name(self, checkpoint_path: str) -> str:
         """Clean checkpoint name for use as folder name"""
-        # Remove file extension
-        name = Path(checkpoint_path).stem
-        
-        # Remove path separators and replace with underscores
-        name = name.replace('\\', '_').replace('/', '_')
-        
-        # Remove or replace problematic characters
-        name = re.sub(r'[<>:"|?*]', '_', name)
-        
-        # Remove version numbers in some cases (optional - you may want to keep them)
-        # name = re.sub(r'_v\d+(\.\d+)?$', '', name)
-        
-        # Limit length
-        if len(name) > 50:
-            name = name[:50]
-        
-        return name
+        return _clean_checkpoint_name(checkpoint_path)
     
     def _create_checkpoint_folders(self, output_dir: str, checkpoint_names: List[str]):
         """Create folders for each checkpoint"""
+        # List the output directory once per run (name_key -> folder name);
+        # only missing folders get a mkdir
+        if self._output_subdirs is None:
+            with os.scandir(output_dir) as entries:
+                self._output_subdirs = {name_key(entry.name): entry.name for entry in entries if entry.is_dir()}
+        
         for checkpoint_name in checkpoint_names:
+            key = name_key(checkpoint_name)
+            existing = self._output_subdirs.get(key)
+            if existing is not None:
+                # Names differing only in case share the folder already on
+                # disk, under one path so they also share its name set
+                self.checkpoint_folders[checkpoint_name] = os.path.join(output_dir, existing)
+                continue
+            
             folder_path = os.path.join(output_dir, checkpoint_name)
-            os.makedirs(folder_path, exist_ok=True)
             self.checkpoint_folders[checkpoint_name] = folder_path
+            self._output_subdirs[key] = checkpoint_name
+            try:
+                os.mkdir(folder_path)
+            except FileExistsError:
+                # Made since the listing, or on a filesystem that ignores
+                # case where name_key doesn't expect it; sort into it as is
+                if not os.path.isdir(folder_path):
+                    raise
+                continue
+            self._dest_names.mark_empty(folder_path)  # brand new, nothing to conflict with
             self.logger.log_folder_created(folder_path)
             self.stats['folders_created'] += 1
     
@@ -354,18 +594,24 @@ class CheckpointSorter:
         user_prefix: str = ""
     ):
         """Sort files into their checkpoint folders"""
-        # Debug logging
-        self.logger._write_log(f"DEBUG: Starting file sorting with {len(checkpoint_groups)} checkpoint groups")
-        for checkpoint, files in checkpoint_groups.items():
-            self.logger._write_log(f"DEBUG: {checkpoint}: {len(files)} files")
-        
         # Calculate total files for progress tracking
         total_files = sum(len(file_list) for file_list in checkpoint_groups.values())
-        self.logger._write_log(f"DEBUG: Total files to process: {total_files}")
         file_count = 0
         
+        # Per-run values hoisted out of the per-file loop
+        progress_callback = getattr(self.logger, 'progress_callback', None)
+        rename_prefix = f"{user_prefix}_img" if rename_files and user_prefix else None
+        
+        # Bigger batches of copies run on a thread pool
+        pool = transfer_pool(total_files, move_files, self._same_device)
+        transfers = {}
+        
+        # Debug logging: group totals only, and only built when enabled
+        debug = self.logger.debug
+        if debug:
+            self.logger.log_debug(f"Sorting {total_files} files in {len(checkpoint_groups)} checkpoint groups")
+        
         for checkpoint_name, file_list in checkpoint_groups.items():
-            self.logger._write_log(f"DEBUG: Processing checkpoint {checkpoint_name} with {len(file_list)} files")
             
             # Check if checkpoint folder exists
             if checkpoint_name not in self.checkpoint_folders:
@@ -373,72 +619,145 @@ class CheckpointSorter:
                 continue
                 
             checkpoint_folder = self.checkpoint_folders[checkpoint_name]
-            self.logger._write_log(f"DEBUG: Target folder: {checkpoint_folder}")
+            if debug:
+                self.logger.log_debug(f"{checkpoint_name}: {len(file_list)} files -> {checkpoint_folder}")
             
             for file_path, rel_path in file_list:
                 file_count += 1
-                self.logger._write_log(f"DEBUG: Processing file {file_count}/{total_files}: {file_path}")
+                
+                # Determine destination path
+                filename = os.path.basename(file_path)
                 
                 # Update progress using the logger's callback system
-                if hasattr(self.logger, 'progress_callback') and self.logger.progress_callback:
-                    self.logger.progress_callback(file_count, total_files, os.path.basename(file_path))
+                # (pooled transfers report as they complete instead)
+                if progress_callback and pool is None:
+                    progress_callback(file_count, total_files, filename)
                 
-                try:
-                    # Determine destination path
-                    filename = os.path.basename(file_path)
-                    
-                    # Apply renaming if requested
-                    if rename_files and user_prefix:
-                        # Get file extension
-                        _, ext = os.path.splitext(filename)
-                        # Create sequential filename: userprefix_img###.png
-                        new_filename = f"{user_prefix}_img{file_count}{ext}"
-                        filename = new_filename
-                    
-                    if rel_path:  # Preserve subfolder structure
-                        dest_folder = os.path.join(checkpoint_folder, rel_path)
-                        os.makedirs(dest_folder, exist_ok=True)
-                        dest_path = os.path.join(dest_folder, filename)
-                    else:
-                        dest_path = os.path.join(checkpoint_folder, filename)
-                    
-                    # Handle filename conflicts
-                    dest_path = self._resolve_filename_conflict(dest_path)
-                    
-                    # Move or copy the file
-                    if move_files:
-                        shutil.move(file_path, dest_path)
-                        operation = "MOVE"
-                    else:
-                        shutil.copy2(file_path, dest_path)
-                        operation = "COPY"
-                    
-                    self.logger.log_file_operation(operation, file_path, dest_path)
-                    self.stats['sorted_images'] += 1
-                    
-                    # Create metadata file if requested
-                    if create_metadata_files:
-                        metadata = metadata_results.get(file_path)
-                        if metadata:
-                            self._create_metadata_file(dest_path, metadata)
+                # Apply renaming if requested
+                if rename_prefix:
+                    # Sequential filename with the original extension: userprefix_img###.png
+                    dot = filename.rfind('.')
+                    filename = f"{rename_prefix}{file_count}{filename[dot:] if dot > 0 else ''}"
+                
+                if pool is None:
+                    self._sort_one_file(
+                        file_path, rel_path, checkpoint_folder, filename,
+                        metadata_results.get(file_path), move_files, create_metadata_files
+                    )
+                    continue
                 
+                # Destinations are planned here, in order, so conflict
+                # resolution stays serial; only the transfers overlap
+                try:
+                    dest_path = self._plan_destination(rel_path, checkpoint_folder, filename)
                 except Exception as e:
                     self.logger.log_error(f"Failed to sort file: {str(e)}", file_path, "File Operation")
+                    continue
+                future = pool.submit(
+                    self._transfer_file, file_path, dest_path,
+                    metadata_results.get(file_path), move_files, create_metadata_files
+                )
+                transfers[future] = (file_path, dest_path)
+        
+        if pool is not None:
+            self.stats['sorted_images'] += finish_transfers(pool, transfers, self.logger, progress_callback)
+    
+    def _sort_one_file(
+        self,
+        file_path: str,
+        rel_path: str,
+        checkpoint_folder: str,
+        filename: str,
+        metadata: Optional[Dict],
+        move_files: bool,
+        create_metadata_files: bool
+    ):
+        """Move or copy one file into its checkpoint folder"""
+        try:
+            dest_path = self._plan_destination(rel_path, checkpoint_folder, filename)
+            operation = self._transfer_file(file_path, dest_path, metadata, move_files, create_metadata_files)
+            self.logger.log_file_operation(operation, file_path, dest_path)
+            self.stats['sorted_images'] += 1
+        
+        except Exception as e:
+            self.logger.log_error(f"Failed to sort file: {str(e)}", file_path, "File Operation")
     
-    def _resolve_filename_conflict(self, dest_path: str) -> str:
-        """Resolve filename conflicts by adding numbers"""
-        if not os.path.exists(dest_path):
-            return dest_path
+    def _plan_destination(self, rel_path: str, checkpoint_folder: str, filename: str) -> str:
+        """Pick a free destination path, creating subfolders as needed (calling thread only)"""
+        if rel_path:  # Preserve subfolder structure
+            dest_folder = os.path.join(checkpoint_folder, rel_path)
+            if dest_folder not in self._made_dirs:
+                self._make_dest_folder(dest_folder)
+        else:
+            dest_folder = checkpoint_folder
+        
+        # Handle filename conflicts
+        free_name = self._dest_names.claim(dest_folder, filename)
+        if free_name != filename:
+            self.stats['duplicates_handled'] += 1
+        return dest_folder + os.sep + free_name  # folder comes from os.path.join, no trailing separator
+    
+    def _transfer_file(
+        self,
+        file_path: str,
+        dest_path: str,
+        metadata: Optional[Dict],
+        move_files: bool,
+        create_metadata_files: bool
+    ) -> str:
+        """Move or copy a file to its planned destination and write its sidecar; safe to run on worker threads"""
+        if move_files:
+            self._move_file(file_path, dest_path)
+            operation = "MOVE"
+        else:
+            self._copy_method = _fast_copy(file_path, dest_path, self._copy_method)
+            operation = "COPY"
         
-        base, ext = os.path.splitext(dest_path)
-        counter = 1
+        # Create metadata file if requested
+        if create_metadata_files and metadata:
+            self._create_metadata_file(dest_path, metadata)
         
-        while os.path.exists(dest_path):
-            dest_path = f"{base}_{counter}{ext}"
-            counter += 1
-            
-        self.stats['duplicates_handled'] += 1
-        return dest_path
+        return operation
+    
+    def _move_file(self, file_path: str, dest_path: str):
+        """Rename in place on the same filesystem, else let shutil copy and delete"""
+        move_file(file_path, dest_path, self._same_device, self._rename)
+    
+    def _rename(self, file_path: str, dest_path: str):
+        """os.replace, relative to this run's directory fds where the platform allows"""
+        src_dir, src_name = os.path.split(file_path)
+        dst_dir, dst_name = os.path.split(dest_path)
+        src_fd = self._dir_fd(src_dir)
+        dst_fd = self._dir_fd(dst_dir)
+        if src_fd is not None and dst_fd is not None:
+            # Only the last path component is looked up per file
+            os.replace(src_name, dst_name, src_dir_fd=src_fd, dst_dir_fd=dst_fd)
+        else:
+            os.replace(file_path, dest_path)
+    
+    def _make_dest_folder(self, folder: str):
+        """Create a destination subfolder once per run; a new one starts with no names to scan"""
+        try:
+            os.makedirs(folder)
+            self._dest_names.mark_empty(folder)
+        except FileExistsError:
+            if not os.path.isdir(folder):
+                raise
+        self._made_dirs.add(folder)
+    
+    def _dir_fd(self, folder: str) -> Optional[int]:
+        """Directory fd for relative renames, opened once per folder per run"""
+        fd = self._dir_fds.get(folder)
+        if fd is None and _RENAME_DIR_FD and len(self._dir_fds) < MAX_DIR_FDS:
+            fd = os.open(folder, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+            self._dir_fds[folder] = fd
+        return fd
+    
+    def _close_dir_fds(self):
+        """Close the directory fds opened for this run's renames"""
+        for fd in self._dir_fds.values():
+            os.close(fd)
+        self._dir_fds.clear()
     
     def _create_metadata_file(self, image_path: str, metadata: Dict):
         """Create a clean text metadata file alongside the image (matching original format)"""
@@ -449,12 +768,56 @@ class CheckpointSorter:
             # Use the enhanced formatter to create clean text
             formatted_text = self.metadata_formatter.format_metadata_to_text(metadata, image_path)
             
-            with open(metadata_path, 'w', encoding='utf-8') as f:
-                f.write(formatted_text)
+            if self._write_q is not None:
+                self._write_q.put((metadata_path, formatted_text))
+            else:
+                self._write_metadata_text(metadata_path, formatted_text)
                 
         except Exception as e:
             self.logger.log_error(f"Failed to create metadata file: {str(e)}", metadata_path, "Metadata Write")
     
+    def _write_metadata_text(self, metadata_path: str, formatted_text: str):
+        """
+        Write one sidecar through a 64 KiB buffer so it lands in a single
+        write, via a temp file so readers never see a half-written sidecar
+        """
+        tmp_path = metadata_path + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8', buffering=1 << 16) as f:
+                f.write(formatted_text)
+            os.replace(tmp_path, metadata_path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    def _start_metadata_writer(self):
+        """Start the thread that writes sidecars while files keep moving"""
+        self._write_q = queue.Queue(maxsize=METADATA_WRITE_QUEUE_SIZE)
+        self._writer_thread = threading.Thread(target=self._writer_loop, args=(self._write_q,), daemon=True)
+        self._writer_thread.start()
+    
+    def _stop_metadata_writer(self):
+        """Flush queued sidecars and wait for the writer thread to finish"""
+        if self._write_q is None:
+            return
+        write_q, self._write_q = self._write_q, None
+        write_q.put(None)  # poison pill
+        self._writer_thread.join()
+        self._writer_thread = None
+    
+    def _writer_loop(self, write_q: queue.Queue):
+        """Write queued sidecars until the poison pill arrives"""
+        while True:
+            item = write_q.get()
+            if item is None:
+                return
+            metadata_path, formatted_text = item
+            try:
+                self._write_metadata_text(metadata_path, formatted_text)
+            except Exception as e:
+                self.logger.log_error(f"Failed to create metadata file: {str(e)}", metadata_path, "Metadata Write")
+    
     def _get_results(self) -> Dict[str, Any]:
         """Get comprehensive sorting results"""
         extractor_stats = self.metadata_extractor.get_statistics()
@@ -1,17 +1,49 @@
 import os
+import io
 import sys
 import shutil
-from collections import Counter
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 from PIL import Image
 import colorsys
 
+try:
+    import numpy as np  # optional: vectorized pixel counting
+except ImportError:
+    np = None
+
 # Add parent directory to path for imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
 parent_dir = os.path.dirname(current_dir)
 sys.path.append(parent_dir)
 
 from core.diagnostics import SortLogger
+from core.file_ops import move_file, link_or_copy, DestinationNames
+
+# Image types picked up when the caller doesn't pass a file list
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.webp'}
+
+# Image.Resampling arrived in Pillow 9.1
+_NEAREST = getattr(Image, 'Resampling', Image).NEAREST
+_BOX = getattr(Image, 'Resampling', Image).BOX
+
+# Similarity key for reuse_similar: an 8x8 box-averaged thumbnail kept at
+# 4 bits per channel, so near-identical images (re-saves, batch repeats)
+# share a key while differently colored ones don't
+_SIMILAR_LEVELS = bytes(v & 0xF0 for v in range(256))
+SIMILAR_CACHE_SIZE = 4096
+_similar_colors = {}  # (dark threshold, key) -> dominant color, per process
+
+# Below this many images a process pool costs more to start than it saves
+PROCESS_POOL_MIN_FILES = 16
+
+# Quality of the JPEGs written by sort_by_color(encode_output=True)
+JPEG_QUALITY = 85
+
+# Re-encoded JPEGs waiting in the parent process, per worker
+ENCODE_IN_FLIGHT_PER_WORKER = 2
 
 # Color categories with RGB ranges
 COLOR_CATEGORIES = {
@@ -28,6 +60,172 @@ COLOR_CATEGORIES = {
     'Gray': [(128, 128, 128), (105, 105, 105), (169, 169, 169), (192, 192, 192)]
 }
 
+def _rgb_to_lab(r, g, b):
+    """sRGB (0-255) to CIE L*a*b* under a D65 white point"""
+    def linear(c):
+        c /= 255.0
+        return c / 12.92 if c <= 0.04045 else ((c + 0.055) / 1.055) ** 2.4
+    
+    def f(t):
+        return t ** (1.0 / 3.0) if t > 0.008856 else 7.787 * t + 16.0 / 116.0
+    
+    rl, gl, bl = linear(r), linear(g), linear(b)
+    fx = f((0.4124 * rl + 0.3576 * gl + 0.1805 * bl) / 0.95047)
+    fy = f(0.2126 * rl + 0.7152 * gl + 0.0722 * bl)
+    fz = f((0.0193 * rl + 0.1192 * gl + 0.9505 * bl) / 1.08883)
+    return 116.0 * fy - 16.0, 500.0 * (fx - fy), 200.0 * (fy - fz)
+
+
+# Every swatch in Lab, tagged with its category; colors go to the category
+# of the nearest swatch by CIE76 delta E. (Averaging a category's swatches
+# would pull its centre towards neighbouring categories - pure blue would
+# land nearer Purple's centroid than Blue's.)
+CATEGORY_LAB = [(category_name, _rgb_to_lab(*color))
+                for category_name, category_colors in COLOR_CATEGORIES.items()
+                for color in category_colors]
+
+# Nearest category for every grouped color (each channel a multiple of 10),
+# built on first use and indexed by (r // 10) * 676 + (g // 10) * 26 + b // 10
+_category_lut = None
+
+
+def _nearest_category(r, g, b):
+    """Category of the swatch whose Lab point is closest to this color"""
+    lab_l, lab_a, lab_b = _rgb_to_lab(r, g, b)
+    best_category = "Unknown"
+    min_distance = float('inf')
+    for category_name, (cat_l, cat_a, cat_b) in CATEGORY_LAB:
+        # Squared delta E (sqrt doesn't change the nearest)
+        dl, da, db = lab_l - cat_l, lab_a - cat_a, lab_b - cat_b
+        distance = dl * dl + da * da + db * db
+        if distance < min_distance:
+            min_distance = distance
+            best_category = category_name
+    return best_category
+
+
+def _get_category_lut():
+    """Category names for all 26^3 grouped colors"""
+    global _category_lut
+    if _category_lut is None:
+        levels = range(0, 256, 10)
+        _category_lut = [_nearest_category(r, g, b) for r in levels for g in levels for b in levels]
+    return _category_lut
+
+
+def _dark_cutoff(ignore_dark_threshold):
+    """Smallest max(R, G, B) that passes the max(R, G, B) / 255.0 >= threshold test"""
+    return next((v for v in range(256) if v / 255.0 >= ignore_dark_threshold), 256)
+
+
+def _dominant_color_np(img, ignore_dark_threshold):
+    """
+    NumPy version of the pixel loop in get_dominant_color: same dark-pixel
+    filter, same 10-step grouping and the same tie-break as Counter.most_common
+    """
+    pixels = np.frombuffer(img.tobytes(), dtype=np.uint8).reshape(-1, 3)
+    
+    # HSV value is max(R, G, B) / 255; compared as an integer cutoff
+    pixels = pixels[pixels.max(axis=1) >= _dark_cutoff(ignore_dark_threshold)]
+    if not len(pixels):
+        return None
+    
+    # Group similar colors into one of 26^3 bins and count them in a single pass
+    grouped = (pixels // 10).astype(np.intp)
+    keys = grouped[:, 0] * 676 + grouped[:, 1] * 26 + grouped[:, 2]
+    counts = np.bincount(keys, minlength=26 ** 3)
+    
+    # Among equally common groups, the one seen first wins
+    tied = np.flatnonzero(counts == counts.max())
+    key = int(tied[0]) if len(tied) == 1 else int(keys[np.isin(keys, tied).argmax()])
+    return ((key // 676) * 10, (key // 26 % 26) * 10, (key % 26) * 10)
+
+def _dominant_color_rgb(img, ignore_dark_threshold, reuse_similar=False):
+    """Dominant (grouped) color of an already decoded RGB image"""
+    # Resize for faster processing; filter quality doesn't matter for
+    # counting colors, so plain sampling will do. Image.reduce() is no
+    # shortcut here: it box-averages every source pixel (blending colors
+    # that are then counted) and costs far more than sampling 150x150 of them
+    img = img.resize((150, 150), _NEAREST)
+    
+    if not reuse_similar:
+        return _count_dominant_color(img, ignore_dark_threshold)
+    
+    # Near-duplicates of an image analyzed earlier get its result
+    key = (ignore_dark_threshold, img.resize((8, 8), _BOX).tobytes().translate(_SIMILAR_LEVELS))
+    if key not in _similar_colors:
+        if len(_similar_colors) >= SIMILAR_CACHE_SIZE:
+            _similar_colors.clear()
+        _similar_colors[key] = _count_dominant_color(img, ignore_dark_threshold)
+    return _similar_colors[key]
+
+def _count_dominant_color(img, ignore_dark_threshold):
+    """Most common grouped color among the bright-enough pixels of a thumbnail"""
+    if np is not None:
+        return _dominant_color_np(img, ignore_dark_threshold)
+    
+    # Get all pixels
+    pixels = list(img.getdata())
+    
+    # Count color frequencies (with some grouping to reduce noise)
+    color_counts = Counter()
+    for r, g, b in pixels:
+        # Skip very dark pixels if requested; HSV value is just
+        # the brightest channel, so hue/saturation aren't needed
+        if max(r, g, b) / 255.0 < ignore_dark_threshold:
+            continue
+        
+        # Group similar colors (reduce precision)
+        grouped_color = (r//10*10, g//10*10, b//10*10)
+        color_counts[grouped_color] += 1
+    
+    if not color_counts:
+        return None
+    
+    # Get most common color
+    return color_counts.most_common(1)[0][0]
+
+def _dominant_color(image_path, ignore_dark_threshold=0.1, reuse_similar=False):
+    """Dominant (grouped) RGB color of an image, ignoring very dark pixels; raises on unreadable files"""
+    with Image.open(image_path) as img:
+        # JPEGs can decode straight at a reduced scale (no-op for other formats)
+        img.draft('RGB', (150, 150))
+        
+        # Convert to RGB if necessary
+        if img.mode != 'RGB':
+            img = img.convert('RGB')
+        
+        return _dominant_color_rgb(img, ignore_dark_threshold, reuse_similar)
+
+
+def _analyze_image(image_path, ignore_dark_threshold, encode_output=False, reuse_similar=False):
+    """Worker-process entry point: (dominant color, error message, JPEG bytes or None)"""
+    try:
+        if not encode_output:
+            return _dominant_color(image_path, ignore_dark_threshold, reuse_similar), '', None
+        
+        # Re-encoding needs the full-size image, so skip draft() and let the
+        # color analysis reuse the pixels decoded for the JPEG
+        with Image.open(image_path) as img:
+            img = img.convert('RGB')
+            buffer = io.BytesIO()
+            img.save(buffer, 'JPEG', quality=JPEG_QUALITY, optimize=True)
+            return _dominant_color_rgb(img, ignore_dark_threshold, reuse_similar), '', buffer.getvalue()
+    except Exception as e:
+        return None, str(e), None
+
+
+def _map_bounded(executor, fn, items, limit):
+    """executor.map in input order, with at most `limit` tasks (and results) outstanding"""
+    pending = deque()
+    for item in items:
+        if len(pending) >= limit:
+            yield pending.popleft().result()
+        pending.append(executor.submit(fn, item))
+    while pending:
+        yield pending.popleft().result()
+
+
 class ColorSorter:
     """Enhanced color sorting with progress tracking and logging"""
     
@@ -41,36 +239,7 @@ class ColorSorter:
     def get_dominant_color(self, image_path, num_colors=5, ignore_dark_threshold=0.1):
         """Extract the dominant color from an image, with option to ignore very dark pixels."""
         try:
-            with Image.open(image_path) as img:
-                # Convert to RGB if necessary
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                # Resize for faster processing
-                img = img.resize((150, 150))
-                
-                # Get all pixels
-                pixels = list(img.getdata())
-                
-                # Count color frequencies (with some grouping to reduce noise)
-                color_counts = Counter()
-                for r, g, b in pixels:
-                    # Skip very dark pixels if requested
-                    h, s, v = self.rgb_to_hsv(r, g, b)
-                    if v < ignore_dark_threshold:
-                        continue
-                    
-                    # Group similar colors (reduce precision)
-                    grouped_color = (r//10*10, g//10*10, b//10*10)
-                    color_counts[grouped_color] += 1
-                
-                if not color_counts:
-                    return None
-                
-                # Get most common color
-                dominant_rgb = color_counts.most_common(1)[0][0]
-                return dominant_rgb
-                
+            return _dominant_color(image_path, ignore_dark_threshold)
         except Exception as e:
             self.logger.log_error(f"Error analyzing color for {image_path}: {e}")
             return None
@@ -81,22 +250,18 @@ class ColorSorter:
             return "Unknown"
         
         r, g, b = rgb_color
-        best_category = "Unknown"
-        min_distance = float('inf')
         
-        for category_name, category_colors in COLOR_CATEGORIES.items():
-            for cat_r, cat_g, cat_b in category_colors:
-                # Calculate Euclidean distance in RGB space
-                distance = ((r - cat_r) ** 2 + (g - cat_g) ** 2 + (b - cat_b) ** 2) ** 0.5
-                if distance < min_distance:
-                    min_distance = distance
-                    best_category = category_name
+        # Dominant colors are grouped to multiples of 10, so they hit the table
+        if not (r % 10 or g % 10 or b % 10) and 0 <= r <= 250 and 0 <= g <= 250 and 0 <= b <= 250:
+            return _get_category_lut()[(r // 10) * 676 + (g // 10) * 26 + b // 10]
         
-        return best_category
+        return _nearest_category(r, g, b)
     
     def sort_by_color(self, source_dir, output_dir, move_files=False, 
                      create_metadata=True, ignore_dark_threshold=0.1,
-                     rename_files=False, user_prefix=''):
+                     rename_files=False, user_prefix='', max_workers=None,
+                     files=None, link_files=False, encode_output=False,
+                     reuse_similar=False):
         """
         Sort images by dominant color into categorized folders
         
@@ -108,6 +273,15 @@ class ColorSorter:
             ignore_dark_threshold: Threshold for ignoring dark pixels (0.0-1.0)
             rename_files: Whether to rename files with sequential numbering
             user_prefix: Custom prefix for renamed files (e.g. 'myproject')
+            max_workers: Number of worker processes analyzing images (None = one per CPU, less one)
+            files: Iterable of image paths in source_dir, may be a generator (None = scan the directory)
+            link_files: When not moving, hard-link instead of copying (copies across devices)
+            encode_output: Write each image as a JPEG re-encoded from the pixels decoded for
+                           color analysis (drops embedded metadata); unreadable images are
+                           copied unchanged. Refused with move_files, which would delete
+                           the originals and their workflow metadata
+            reuse_similar: Give near-identical images (same 8x8 color thumbnail) the color
+                           found for the first of them instead of counting pixels again
         """
         source_path = Path(source_dir)
         output_path = Path(output_dir)
@@ -117,16 +291,27 @@ class ColorSorter:
         self.logger.start_operation(operation_name)
         self.logger.log_config("Source", str(source_path))
         self.logger.log_config("Output", str(output_path))
-        self.logger.log_config("Operation", "MOVE" if move_files else "COPY")
+        self.logger.log_config("Operation", "MOVE" if move_files else "LINK" if link_files else "COPY")
         self.logger.log_config("Dark threshold", str(ignore_dark_threshold))
+        if encode_output:
+            self.logger.log_config("Re-encode", f"JPEG, quality {JPEG_QUALITY}")
+            if move_files:
+                self.logger.log_error("Re-encoding can't be combined with moving: the original "
+                                      "images and their embedded metadata would be deleted")
+                return False
         
-        # Find all image files
-        image_extensions = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.webp'}
-        image_files = []
-        
-        for ext in image_extensions:
-            image_files.extend(source_path.glob(f'*{ext}'))
-            image_files.extend(source_path.glob(f'*{ext.upper()}'))
+        # Find all image files, unless the caller already listed them
+        if files is not None:
+            image_files = [Path(f) for f in files]  # materialized once; used by two passes
+        else:
+            # One directory read with a case-insensitive suffix check; like
+            # the per-extension glob it replaces, dotfiles are included
+            with os.scandir(source_path) as entries:
+                image_files = [
+                    Path(entry.path) for entry in entries
+                    if os.path.splitext(entry.name)[1].lower() in IMAGE_EXTENSIONS
+                    and entry.is_file()
+                ]
         
         if not image_files:
             self.logger.log_error("No image files found in source directory")
@@ -137,120 +322,117 @@ class ColorSorter:
         
         # Create output directory
         output_path.mkdir(parents=True, exist_ok=True)
+        same_device = os.stat(source_path).st_dev == os.stat(output_path).st_dev
         
         # Track statistics
         color_stats = {}
-        file_color_mapping = {}  # Store color info separately from path objects
+        category_dirs = {}  # color category -> its output folder, built once
+        dest_names = DestinationNames()  # file names taken in each category folder
+        rename_counters = {}  # next sequential number per color category
         successful = 0
         failed = 0
         
-        # Analyze colors
-        self.logger.start_phase("Color Analysis")
-        
-        for i, image_file in enumerate(image_files):
-            if i % 25 == 0:  # Progress every 25 files
-                self.logger.update_progress(i, total_files, str(image_file.name))
-            
-            # Get dominant color
-            dominant_color = self.get_dominant_color(str(image_file), ignore_dark_threshold=ignore_dark_threshold)
-            color_category = self.categorize_color(dominant_color)
-            
-            # Track statistics
-            if color_category not in color_stats:
-                color_stats[color_category] = 0
-            color_stats[color_category] += 1
-            
-            # Store result for sorting phase in separate dictionary
-            file_color_mapping[str(image_file)] = {
-                'color_category': color_category,
-                'dominant_color': dominant_color
-            }
-        
-        self.logger.end_phase("Color Analysis")
-        
-        # Create color category folders
-        self.logger.start_phase("Folder Creation")
+        # Analyze and sort in one pass: each file is moved/copied as soon as
+        # its color is known
+        self.logger.start_phase("Color Analysis & File Sorting")
         
-        for color_category in color_stats.keys():
-            category_dir = output_path / color_category
-            category_dir.mkdir(exist_ok=True)
-            self.logger.log_folder_operation("Created", str(category_dir))
+        # Decoding and pixel counting are CPU-bound, so they run on worker
+        # processes; results come back in input order
+        if max_workers is None:
+            max_workers = max(1, (os.cpu_count() or 2) - 1)
+        paths = [str(image_file) for image_file in image_files]
+        analyze = partial(_analyze_image, ignore_dark_threshold=ignore_dark_threshold,
+                          encode_output=encode_output, reuse_similar=reuse_similar)
+        executor = None
+        if max_workers > 1 and total_files >= PROCESS_POOL_MIN_FILES:
+            executor = ProcessPoolExecutor(max_workers=max_workers)
+            if encode_output:
+                # Each result carries a whole JPEG, so only a few are queued
+                # ahead of the files being written
+                results = _map_bounded(executor, analyze, paths,
+                                       max_workers * ENCODE_IN_FLIGHT_PER_WORKER)
+            else:
+                results = executor.map(analyze, paths, chunksize=8)
+        else:
+            results = map(analyze, paths)
         
-        self.logger.end_phase("Folder Creation")
-        
-        # Sort files into color folders
-        self.logger.start_phase("File Sorting")
-        
-        # Initialize renaming counters for each color category
-        rename_counters = {}
-        if rename_files:
-            for color_category in color_stats.keys():
-                rename_counters[color_category] = 1
-        
-        for i, image_file in enumerate(image_files):
-            try:
-                file_path_str = str(image_file)
-                color_info = file_color_mapping.get(file_path_str, {})
-                color_category = color_info.get('color_category', 'Unknown')
-                target_dir = output_path / color_category
-                
-                # Generate target filename
-                if rename_files:
-                    # Create sequential numbered filename
-                    counter = rename_counters[color_category]
-                    if user_prefix:
-                        # Use custom prefix with color category
-                        new_name = f"{user_prefix}_{color_category.lower()}_img{counter}{image_file.suffix}"
-                    else:
-                        # Use color category with sequential number
-                        new_name = f"{color_category.lower()}_img{counter}{image_file.suffix}"
-                    target_file = target_dir / new_name
-                    rename_counters[color_category] += 1
-                else:
-                    # Use original filename
-                    target_file = target_dir / image_file.name
-                    
-                    # Handle name conflicts for original filenames
-                    counter = 1
-                    while target_file.exists():
-                        stem = image_file.stem
-                        suffix = image_file.suffix
-                        target_file = target_dir / f"{stem}_{counter}{suffix}"
-                        counter += 1
+        try:
+            for i, (image_file, (dominant_color, error, encoded)) in enumerate(zip(image_files, results)):
+                if i % 25 == 0:  # Progress every 25 files
+                    self.logger.update_progress(i, total_files, str(image_file.name))
                 
-                # Move or copy file
-                if move_files:
-                    shutil.move(str(image_file), str(target_file))
-                    operation = "MOVED"
-                else:
-                    shutil.copy2(str(image_file), str(target_file))
-                    operation = "COPIED"
+                if error:
+                    self.logger.log_error(f"Error analyzing color for {image_file}: {error}")
                 
-                self.logger.log_file_operation(operation, str(image_file), str(target_file))
-                successful += 1
+                color_category = self.categorize_color(dominant_color)
+                target_dir = category_dirs.get(color_category)
                 
-                if i % 25 == 0:  # Progress every 25 files
-                    self.logger.update_progress(i, total_files, str(image_file.name))
+                # Create the category folder the first time it is needed
+                if target_dir is None:
+                    target_dir = category_dirs[color_category] = output_path / color_category
+                    color_stats[color_category] = 0
+                    rename_counters[color_category] = 1
+                    target_dir.mkdir(exist_ok=True)
+                    self.logger.log_folder_operation("Created", str(target_dir))
+                color_stats[color_category] += 1
                 
-            except Exception as e:
-                self.logger.log_error(f"Failed to process {image_file}: {e}")
-                failed += 1
+                try:
+                    # Re-encoded images are always JPEGs
+                    suffix = '.jpg' if encoded is not None else image_file.suffix
+                    
+                    # Generate target filename
+                    if rename_files:
+                        # Create sequential numbered filename
+                        counter = rename_counters[color_category]
+                        if user_prefix:
+                            # Use custom prefix with color category
+                            new_name = f"{user_prefix}_{color_category.lower()}_img{counter}{suffix}"
+                        else:
+                            # Use color category with sequential number
+                            new_name = f"{color_category.lower()}_img{counter}{suffix}"
+                        target_file = target_dir / new_name
+                        rename_counters[color_category] += 1
+                    else:
+                        # Use original filename, handling name conflicts
+                        # against the folder's known contents
+                        target_file = target_dir / dest_names.claim(str(target_dir), image_file.stem + suffix)
+                    
+                    # Write the re-encoded image, or move/copy the original
+                    if encoded is not None:
+                        target_file.write_bytes(encoded)
+                        operation = "ENCODED"
+                    elif move_files:
+                        move_file(str(image_file), str(target_file), same_device)
+                        operation = "MOVED"
+                    elif link_files:
+                        operation = link_or_copy(str(image_file), str(target_file))
+                    else:
+                        shutil.copy2(str(image_file), str(target_file))
+                        operation = "COPIED"
+                    
+                    self.logger.log_file_operation(operation, str(image_file), str(target_file))
+                    successful += 1
+                    
+                except Exception as e:
+                    self.logger.log_error(f"Failed to process {image_file}: {e}")
+                    failed += 1
+        finally:
+            if executor:
+                executor.shutdown()
         
-        self.logger.end_phase("File Sorting")
+        self.logger.end_phase("Color Analysis & File Sorting")
         
         # Create metadata files if requested
         if create_metadata:
             self.logger.start_phase("Metadata Creation")
             
+            # Lines shared by every category are formatted once
+            footer = (f"Sort Date: {self.logger.session_id}\n"
+                      f"Dark Threshold: {ignore_dark_threshold}\n")
             for color_category, count in color_stats.items():
-                category_dir = output_path / color_category
-                metadata_file = category_dir / "color_info.txt"
-                
-                with open(metadata_file, 'w') as f:
-                    f.write(f"Color Category: {color_category}\n")
-                    f.write(f"Image Count: {count}\n")
-                    f.write(f"Sort Date: {self.logger.session_id}\n")
-                    f.write(f"Dark Threshold: {ignore_dark_threshold}\n")
+                metadata_file = category_dirs[color_category] / "color_info.txt"
+                metadata_file.write_text(
+                    f"Color Category: {color_category}\nImage Count: {count}\n{footer}")
                 
                 self.logger.log_file_operation("CREATED", "metadata", str(metadata_file))
             
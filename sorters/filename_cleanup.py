@@ -6,11 +6,26 @@ Cleans up filenames from previous sorting operations and removes unwanted metada
 
 import os
 import re
-import shutil
+import time
 from pathlib import Path
 from typing import List, Tuple, Dict
 import json
 
+# Workflow leftovers stripped from filenames, applied in this order
+_WORKFLOW_PATTERNS = [
+    re.compile(r'\[workflow_test_batch\d+\]\s*'),  # [workflow_test_batch1] 
+    re.compile(r'Gen\s+\d+\s+'),                   # Gen 31 
+    re.compile(r'\$\d+'),                          # $0152
+    re.compile(r'_+'),                             # Multiple underscores
+    re.compile(r'^[\s\-_]+|[\s\-_]+$'),            # Leading/trailing spaces, dashes, underscores
+]
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Files _should_rename_file considers: images whose name has a workflow marker
+_RENAME_EXTS = ('.png', '.jpg', '.jpeg', '.webp')
+_RENAME_TRIGGER_RE = re.compile(r'\[workflow|\$|batch|Gen ')
+_UNDERSCORES_RE = re.compile(r'_+')
+
 class FilenameCleanup:
     """Clean up filenames and remove metadata files from previous sorting operations"""
     
@@ -104,7 +119,8 @@ class FilenameCleanup:
                                 if os.path.exists(new_path):
                                     new_path = self._resolve_naming_conflict(new_path)
                                 
-                                shutil.move(file_path, new_path)
+                                # Same directory, so always a plain rename
+                                os.rename(file_path, new_path)
                                 self.stats['files_renamed'] += 1
                                 self.logger._write_log(f"Renamed: {filename} → {os.path.basename(new_path)}")
                             except Exception as e:
@@ -130,13 +146,8 @@ class FilenameCleanup:
     
     def _should_rename_file(self, filename: str) -> bool:
         """Check if a file should be renamed"""
-        # Skip already clean filenames
-        if not any(pattern in filename for pattern in ['[workflow', '$', 'batch', 'Gen ']):
-            return False
-        
-        # Only process image files
-        extensions = ['.png', '.jpg', '.jpeg', '.webp']
-        return any(filename.lower().endswith(ext) for ext in extensions)
+        # Only process image files that still carry workflow leftovers
+        return filename.lower().endswith(_RENAME_EXTS) and _RENAME_TRIGGER_RE.search(filename) is not None
     
     def _clean_filename(self, filename: str, prefix: str = "image") -> str:
         """Clean up a filename by removing workflow prefixes and unnecessary parts"""
@@ -144,23 +155,14 @@ class FilenameCleanup:
         name, ext = os.path.splitext(filename)
         
         # Remove common workflow patterns
-        patterns = [
-            r'\[workflow_test_batch\d+\]\s*',  # [workflow_test_batch1] 
-            r'Gen\s+\d+\s+',                   # Gen 31 
-            r'\$\d+',                          # $0152
-            r'_+',                             # Multiple underscores
-            r'^[\s\-_]+',                      # Leading spaces, dashes, underscores
-            r'[\s\-_]+$',                      # Trailing spaces, dashes, underscores
-        ]
-        
         cleaned = name
-        for pattern in patterns:
-            cleaned = re.sub(pattern, '', cleaned)
+        for pattern in _WORKFLOW_PATTERNS:
+            cleaned = pattern.sub('', cleaned)
         
         # Clean up remaining artifacts
-        cleaned = re.sub(r'\s+', '_', cleaned)  # Replace spaces with underscores
-        cleaned = re.sub(r'_+', '_', cleaned)   # Collapse multiple underscores
-        cleaned = cleaned.strip('_-')          # Remove leading/trailing separators
+        cleaned = _WHITESPACE_RE.sub('_', cleaned)   # Replace spaces with underscores
+        cleaned = _UNDERSCORES_RE.sub('_', cleaned)  # Collapse multiple underscores
+        cleaned = cleaned.strip('_-')                # Remove leading/trailing separators
         
         # Ensure we have a valid filename
         if not cleaned:
@@ -168,7 +170,6 @@ class FilenameCleanup:
         
         # Add timestamp if still generic or matches the prefix exactly
         if cleaned.lower() in [prefix.lower(), 'image', 'img', 'pic', 'photo']:
-            import time
             timestamp = str(int(time.time()))
             cleaned = f"{prefix}_{timestamp}"
         
@@ -8,6 +8,8 @@ Includes enhanced logging and duplicate handling.
 import os
 import sys
 import shutil
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
 
 # Add parent directory to path for imports
@@ -16,6 +18,7 @@ parent_dir = os.path.dirname(current_dir)
 sys.path.append(parent_dir)
 
 from core.diagnostics import SortLogger
+from core.file_ops import move_file, link_or_copy, DestinationNames
 
 class ImageFlattener:
     """Enhanced image flattening with progress tracking and logging"""
@@ -23,10 +26,14 @@ class ImageFlattener:
     def __init__(self, logger: SortLogger = None):
         self.logger = logger or SortLogger()
         self.image_extensions = {'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp', '.svg'}
+        
+        # Image list from the last preview with the mtime of every folder it
+        # walked, so flatten_images can skip a second walk of an unchanged tree
+        self._scan_cache = None
     
     def flatten_images(self, source_dir, target_dir="flattened_images", 
                       move_files=False, remove_empty_dirs=True,
-                      rename_files=False, user_prefix=''):
+                      rename_files=False, user_prefix='', link_files=False):
         """
         Flatten all images from nested folders into a single target directory
         
@@ -37,6 +44,7 @@ class ImageFlattener:
             remove_empty_dirs: Whether to remove empty directories after flattening
             rename_files: Whether to rename files with sequential numbering
             user_prefix: Custom prefix for renamed files (e.g. 'myproject')
+            link_files: When not moving, hard-link instead of copying (copies across devices)
         """
         source_path = Path(source_dir)
         target_path = Path(target_dir)
@@ -46,20 +54,23 @@ class ImageFlattener:
         self.logger.start_operation(operation_name)
         self.logger.log_config("Source", str(source_path))
         self.logger.log_config("Target", str(target_path))
-        self.logger.log_config("Operation", "MOVE" if move_files else "COPY")
+        self.logger.log_config("Operation", "MOVE" if move_files else "LINK" if link_files else "COPY")
         self.logger.log_config("Remove empty dirs", str(remove_empty_dirs))
         
+        # Reuse the preview walk when still valid; checked before the target
+        # is created, since creating it inside the source changes the
+        # source's mtime (a new, empty target adds no images)
+        image_files = self._take_cached_scan(source_path)
+        
         # Create target directory
         target_path.mkdir(parents=True, exist_ok=True)
         self.logger.log_folder_operation("Created", str(target_path))
+        same_device = os.stat(source_path).st_dev == os.stat(target_path).st_dev
         
         # Find all image files
-        image_files = []
-        for root, dirs, files in os.walk(source_path):
-            for file in files:
-                file_path = Path(root) / file
-                if file_path.suffix.lower() in self.image_extensions:
-                    image_files.append(file_path)
+        if image_files is None:
+            image_files = [file_path for folder, images in self._walk_images(source_path)
+                           for file_path in images]
         
         if not image_files:
             self.logger.log_error("No image files found in source directory")
@@ -75,6 +86,8 @@ class ImageFlattener:
         failed_count = 0
         duplicates_count = 0
         rename_counter = 1  # Initialize counter for renaming
+        # Conflicts are checked against the target's known contents, not on disk
+        dest_names = DestinationNames()
         
         for i, file_path in enumerate(image_files):
             try:
@@ -89,21 +102,17 @@ class ImageFlattener:
                     rename_counter += 1
                 else:
                     # Use original filename with conflict resolution
-                    target_file = target_path / file_path.name
-                    original_target = target_file
-                    counter = 1
-                    
-                    while target_file.exists():
-                        stem = file_path.stem
-                        suffix = file_path.suffix
-                        target_file = target_path / f"{stem}_{counter}{suffix}"
-                        counter += 1
+                    name = dest_names.claim(str(target_path), file_path.name)
+                    if name != file_path.name:
                         duplicates_count += 1
+                    target_file = target_path / name
                 
                 # Move or copy the file
                 if move_files:
-                    shutil.move(str(file_path), str(target_file))
+                    move_file(str(file_path), str(target_file), same_device)
                     operation = "MOVED"
+                elif link_files:
+                    operation = link_or_copy(str(file_path), str(target_file))
                 else:
                     shutil.copy2(str(file_path), str(target_file))
                     operation = "COPIED"
@@ -146,8 +155,11 @@ class ImageFlattener:
         Remove empty directories recursively, starting from the deepest level.
         """
         removed_count = 0
+        removed = set()  # directories already removed in this walk
         
-        # Walk the directory tree bottom-up
+        # Walk the directory tree bottom-up; children come before their
+        # parent, so a folder is empty if it had no files and every
+        # subfolder has just been removed, no need to list it again
         for root, dirs, files in os.walk(path, topdown=False):
             root_path = Path(root)
             
@@ -155,18 +167,88 @@ class ImageFlattener:
             if root_path == path:
                 continue
             
+            if files or not all(os.path.join(root, d) in removed for d in dirs):
+                continue
+            
             try:
-                # Try to remove if directory is empty
-                if not any(root_path.iterdir()):
-                    root_path.rmdir()
-                    self.logger.log_folder_operation("Removed empty", str(root_path))
-                    removed_count += 1
+                root_path.rmdir()
+                removed.add(root)
+                self.logger.log_folder_operation("Removed empty", str(root_path))
+                removed_count += 1
             except OSError:
-                # Directory not empty or other error
+                # Something appeared in the directory meanwhile, or other error
                 pass
         
         return removed_count
     
+    def _scan_dir(self, folder):
+        """List one directory: (subdirectories to descend into, image files, mtime before listing)"""
+        subdirs = []
+        images = []
+        mtime = None
+        try:
+            mtime = os.stat(folder).st_mtime_ns
+            with os.scandir(folder) as entries:
+                for entry in entries:
+                    if entry.is_dir():
+                        # Like os.walk, don't descend into symlinked dirs
+                        if not entry.is_symlink():
+                            subdirs.append(Path(entry.path))
+                    elif os.path.splitext(entry.name)[1].lower() in self.image_extensions:
+                        images.append(Path(entry.path))
+        except OSError:
+            # Unreadable directories are skipped, as os.walk does
+            pass
+        return subdirs, images, mtime
+    
+    def _walk_images(self, source_path, max_workers=None, mtimes=None):
+        """
+        Walk the tree with directory reads spread over a thread pool.
+        Returns [(folder, image paths)] in the same top-down order as os.walk;
+        each folder's mtime is recorded in mtimes when given.
+        """
+        max_workers = max_workers or min(32, (os.cpu_count() or 1) * 2)
+        listings = {}
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {executor.submit(self._scan_dir, source_path): source_path}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    folder = pending.pop(future)
+                    subdirs, images, mtime = future.result()
+                    listings[folder] = (subdirs, images)
+                    if mtimes is not None:
+                        mtimes[folder] = mtime
+                    for subdir in subdirs:
+                        pending[executor.submit(self._scan_dir, subdir)] = subdir
+        
+        # Reassemble in os.walk order so numbering and conflict suffixes stay stable
+        ordered = []
+        stack = [source_path]
+        while stack:
+            folder = stack.pop()
+            subdirs, images = listings[folder]
+            ordered.append((folder, images))
+            stack.extend(reversed(subdirs))
+        return ordered
+    
+    def _take_cached_scan(self, source_path):
+        """Return (and clear) the preview's image list if it still matches source_path"""
+        cache, self._scan_cache = self._scan_cache, None
+        if not cache or cache[0] != str(source_path):
+            return None
+        
+        # Adding, removing or renaming an entry changes its folder's mtime,
+        # so an unchanged mtime everywhere means an unchanged image list
+        for folder, mtime in cache[1].items():
+            try:
+                if os.stat(folder).st_mtime_ns != mtime:
+                    return None
+            except OSError:
+                return None
+        return cache[2]
+    
     def preview_flatten(self, source_dir):
         """
         Preview what would happen during flattening without actually moving files
@@ -176,19 +258,19 @@ class ImageFlattener:
         print(f"🔍 FLATTENING PREVIEW for: {source_path}")
         print("=" * 60)
         
-        # Find all image files and their locations
+        # Find all image files and their locations, counting filenames for
+        # the conflict check in the same pass
         folder_stats = {}
+        filename_counts = Counter()
         total_images = 0
+        image_files = []
+        mtimes = {}
         
-        for root, dirs, files in os.walk(source_path):
-            folder = Path(root)
-            image_count = 0
-            
-            for file in files:
-                file_path = folder / file
-                if file_path.suffix.lower() in self.image_extensions:
-                    image_count += 1
-                    total_images += 1
+        for folder, images in self._walk_images(source_path, mtimes=mtimes):
+            image_files.extend(images)
+            filename_counts.update(file_path.name for file_path in images)
+            image_count = len(images)
+            total_images += image_count
             
             if image_count > 0:
                 relative_path = folder.relative_to(source_path) if folder != source_path else "ROOT"
@@ -204,15 +286,6 @@ class ImageFlattener:
             print(f"  {folder}: {count} images")
         
         # Check for potential name conflicts
-        all_filenames = []
-        for root, dirs, files in os.walk(source_path):
-            for file in files:
-                file_path = Path(root) / file
-                if file_path.suffix.lower() in self.image_extensions:
-                    all_filenames.append(file)
-        
-        from collections import Counter
-        filename_counts = Counter(all_filenames)
         duplicates = {name: count for name, count in filename_counts.items() if count > 1}
         
         if duplicates:
@@ -223,6 +296,8 @@ class ImageFlattener:
         else:
             print(f"\n✅ No filename conflicts detected")
         
+        self._scan_cache = (str(source_path), mtimes, image_files)
+        
         return {
             'total_images': total_images,
             'folders': len(folder_stats),
@@ -17,20 +17,55 @@ import shutil
 import json
 import re
 import sys
-from typing import Dict, List, Tuple, Optional, Set
+from typing import Dict, List, Tuple, Optional, Union, Pattern
 from pathlib import Path
 
+try:
+    import ahocorasick  # optional: one-pass matching of several literal terms
+except ImportError:
+    ahocorasick = None
+
+try:
+    import re2  # optional: linear-time regex matching, opt-in via use_re2 (google-re2)
+    _RE2_OPTIONS = re2.Options()
+    _RE2_OPTIONS.log_errors = False  # rejected patterns fall back to re quietly
+except (ImportError, AttributeError):
+    re2 = None
+
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.metadata_engine import MetadataExtractor, MetadataAnalyzer
+from core.metadata_engine import MetadataExtractor, MetadataAnalyzer, MetadataCache
 from core.diagnostics import SortLogger
+from core.file_ops import move_file, transfer_pool, finish_transfers, safe_folder_name, DestinationNames
+
+# str's own substring search beats an automaton walk until there are
+# roughly this many "any" terms to try per field
+AUTOMATON_MIN_TERMS = 32
+
+# PNG chunk reads are I/O-bound, so metadata extraction defaults to a
+# generous thread count
+EXTRACT_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Files sampled to estimate how selective each "all" term is
+TERM_SAMPLE_SIZE = 64
+
+# Analyzer extractor each derived search field comes from
+_FIELD_SOURCES = {
+    'checkpoints': 'checkpoints',
+    'loras': 'loras',
+    'lora_name': 'loras',
+    'positive_prompt': 'prompts',
+    'negative_prompt': 'prompts',
+    'prompts': 'prompts',
+    'sampling_params': 'sampling',
+}
 
 class MetadataSearchSorter:
     """Sort images based on metadata content search"""
     
-    def __init__(self, logger: Optional[SortLogger] = None):
-        self.metadata_extractor = MetadataExtractor()
+    def __init__(self, logger: Optional[SortLogger] = None, metadata_cache: Optional[MetadataCache] = None):
+        self.metadata_extractor = MetadataExtractor(cache=metadata_cache)
         self.metadata_analyzer = MetadataAnalyzer()
         self.logger = logger or SortLogger()
         
@@ -45,6 +80,20 @@ class MetadataSearchSorter:
         
         # Search results tracking
         self.search_results = {}
+        
+        # Analyzer-derived fields per file path for the current run, filled
+        # as extraction results arrive and reused by the search phase
+        self._content_cache = {}
+        
+        # Output folder -> file names in it (listed once per run, then
+        # kept current as destinations are handed out)
+        self._dest_names = DestinationNames()
+        
+        # Whether source and output share a filesystem, so moves can be renames
+        self._same_device = False
+        
+        # Analyzer extractors the current run's search fields need (None = all)
+        self._needed_sources = None
     
     def search_and_sort(
         self,
@@ -58,7 +107,10 @@ class MetadataSearchSorter:
         case_sensitive: bool = False,
         use_regex: bool = False,
         rename_files: bool = False,
-        user_prefix: str = ''
+        user_prefix: str = '',
+        max_workers: Optional[int] = None,
+        files: Optional[List[str]] = None,
+        use_re2: bool = False
     ) -> Dict[str, any]:
         """
         Search metadata and sort matching images
@@ -75,6 +127,11 @@ class MetadataSearchSorter:
             use_regex: Whether to treat search terms as regex patterns
             rename_files: Whether to rename files with sequential numbering
             user_prefix: Custom prefix for renamed files (e.g. 'myproject')
+            max_workers: Number of threads reading image metadata concurrently (None = EXTRACT_WORKERS)
+            files: Iterable of PNG paths in source_dir, may be a generator (None = scan the directory)
+            use_re2: With use_regex, compile patterns with RE2 (google-re2) when installed, falling
+                back to re per pattern. RE2 runs in linear time, but its \\w, \\d, \\s and \\b are
+                ASCII-only, so non-ASCII prompts can match differently than with re
             
         Returns:
             Dictionary with search results and statistics
@@ -89,8 +146,8 @@ class MetadataSearchSorter:
         
         self.stats['search_terms_used'] = len(search_terms)
         
-        # Find all PNG files
-        png_files = self._find_png_files(source_dir)
+        # Find all PNG files, unless the caller already listed them
+        png_files = list(files) if files is not None else self._find_png_files(source_dir)
         self.stats['total_images'] = len(png_files)
         
         if not png_files:
@@ -99,17 +156,22 @@ class MetadataSearchSorter:
         
         # Create output directory
         os.makedirs(output_dir, exist_ok=True)
+        self._content_cache.clear()
+        self._dest_names.clear()
+        self._same_device = os.stat(source_dir).st_dev == os.stat(output_dir).st_dev
+        self._needed_sources = ({_FIELD_SOURCES[field] for field in search_fields if field in _FIELD_SOURCES}
+                                if search_fields else None)
         
         # Phase 1: Extract all metadata
         self.logger.start_operation("Metadata Extraction", len(png_files))
-        metadata_results = self._extract_all_metadata(png_files)
+        metadata_results = self._extract_all_metadata(png_files, max_workers or EXTRACT_WORKERS)
         self.logger.complete_operation()
         
         # Phase 2: Search metadata
         self.logger.start_operation("Metadata Search")
         search_matches = self._search_metadata(
             png_files, metadata_results, search_terms, 
-            search_mode, search_fields, case_sensitive, use_regex
+            search_mode, search_fields, case_sensitive, use_regex, use_re2
         )
         self.logger.complete_operation()
         
@@ -119,7 +181,7 @@ class MetadataSearchSorter:
             organized_results = self._organize_by_search_terms(search_matches, search_terms)
             self.logger.complete_operation()
         else:
-            organized_results = {"search_results": list(search_matches)}
+            organized_results = {"search_results": search_matches}
         
         # Phase 4: Create folder structure
         self.logger.start_operation("Folder Creation")
@@ -133,6 +195,7 @@ class MetadataSearchSorter:
             rename_files, user_prefix
         )
         self.logger.complete_operation()
+        self._content_cache.clear()
         
         # Generate summary
         results = self._get_results()
@@ -147,7 +210,8 @@ class MetadataSearchSorter:
         source_dir: str,
         output_dir: str,
         lora_name: str,
-        move_files: bool = False
+        move_files: bool = False,
+        files: Optional[List[str]] = None
     ) -> Dict[str, any]:
         """
         Convenience method to search for a specific LoRA
@@ -161,7 +225,8 @@ class MetadataSearchSorter:
             search_fields=["lora_name"],
             move_files=move_files,
             create_subfolders=False,
-            case_sensitive=False
+            case_sensitive=False,
+            files=files
         )
     
     def search_by_prompt_keywords(
@@ -170,7 +235,8 @@ class MetadataSearchSorter:
         output_dir: str,
         keywords: List[str],
         move_files: bool = False,
-        require_all_keywords: bool = False
+        require_all_keywords: bool = False,
+        files: Optional[List[str]] = None
     ) -> Dict[str, any]:
         """
         Convenience method to search by prompt keywords
@@ -183,25 +249,29 @@ class MetadataSearchSorter:
             search_fields=["positive_prompt", "negative_prompt"],
             move_files=move_files,
             create_subfolders=True,
-            case_sensitive=False
+            case_sensitive=False,
+            files=files
         )
     
     def _find_png_files(self, source_dir: str) -> List[str]:
         """Find all PNG files in source directory"""
-        png_files = []
-        
-        for file in os.listdir(source_dir):
-            if file.lower().endswith('.png'):
-                png_files.append(os.path.join(source_dir, file))
-        
-        return png_files
+        # DirEntry.path comes ready-joined; only the extension is case-folded
+        with os.scandir(source_dir) as entries:
+            return [entry.path for entry in entries
+                    if entry.name[-4:].lower() == '.png' and entry.is_file()]
     
-    def _extract_all_metadata(self, png_files: List[str]) -> Dict[str, Optional[Dict]]:
+    def _extract_all_metadata(self, png_files: List[str], max_workers: int = 1) -> Dict[str, Optional[Dict]]:
         """Extract metadata from all PNG files"""
         def progress_callback(current, total, filename):
-            self.logger.update_progress(current, filename)
+            self.logger.update_progress(current, total, filename)
+        
+        def derive_fields(file_path, metadata):
+            # Runs while worker threads are still reading later files
+            if metadata:
+                self._content_cache[file_path] = self._derive_fields(metadata)
         
-        return self.metadata_extractor.extract_batch(png_files, progress_callback)
+        return self.metadata_extractor.extract_batch(png_files, progress_callback, max_workers,
+                                                     on_result=derive_fields)
     
     def _search_metadata(
         self,
@@ -211,10 +281,31 @@ class MetadataSearchSorter:
         search_mode: str,
         search_fields: Optional[List[str]],
         case_sensitive: bool,
-        use_regex: bool
-    ) -> Set[str]:
-        """Search metadata for matching terms"""
-        matches = set()
+        use_regex: bool,
+        use_re2: bool = False
+    ) -> List[str]:
+        """Search metadata for matching terms (matches keep png_files order)"""
+        matches = []
+        
+        # Lowercase / compile the terms once for the whole run
+        prepared_terms = self._prepare_terms(search_terms, case_sensitive, use_regex, use_re2)
+        
+        # Many literal "any" terms: scan each field once with an Aho-Corasick
+        # automaton instead of once per term
+        automaton = None
+        if (ahocorasick is not None and search_mode == "any" and len(prepared_terms) >= AUTOMATON_MIN_TERMS
+                and all(isinstance(term, str) and term for term in prepared_terms)):
+            automaton = self._build_term_automaton(prepared_terms)
+        
+        # AND searches reject a file at its first missing term, so try the
+        # terms that match the fewest files first
+        if search_mode == "all" and len(prepared_terms) > 1:
+            prepared_terms = self._order_terms_by_rarity(
+                prepared_terms, png_files, metadata_results, search_fields, case_sensitive
+            )
+        
+        exact_terms = search_terms if case_sensitive else [term.lower() for term in search_terms]
+        match_cache = {}  # searched content -> whether it matched
         
         for file_path in png_files:
             metadata = metadata_results.get(file_path)
@@ -223,130 +314,255 @@ class MetadataSearchSorter:
                 continue
             
             # Extract searchable content
-            searchable_content = self._extract_searchable_content(metadata, search_fields)
+            searchable_content = self._extract_searchable_content(metadata, search_fields, case_sensitive, file_path)
+            
+            # Batches repeat prompts and LoRAs, so identical searched content
+            # reuses its earlier result; the full workflow (seeds etc.) is
+            # unique per image, so content that includes it isn't memoized
+            key = None
+            if 'full_metadata' not in searchable_content:
+                key = tuple(searchable_content.values())
+                if key in match_cache:
+                    if match_cache[key]:
+                        matches.append(file_path)
+                    continue
             
             # Perform search based on mode
-            if search_mode == "any":
+            if automaton is not None:
+                # OR logic, every term checked in one pass per field
+                matched = self._search_automaton(searchable_content, automaton)
+            
+            elif search_mode == "any":
                 # OR logic - any term matches
-                if self._search_any_term(searchable_content, search_terms, case_sensitive, use_regex):
-                    matches.add(file_path)
+                matched = self._search_any_term(searchable_content, prepared_terms)
                     
             elif search_mode == "all":
                 # AND logic - all terms must match
-                if self._search_all_terms(searchable_content, search_terms, case_sensitive, use_regex):
-                    matches.add(file_path)
+                matched = self._search_all_terms(searchable_content, prepared_terms)
                     
             elif search_mode == "exact":
                 # Exact match
-                if self._search_exact_match(searchable_content, search_terms, case_sensitive):
-                    matches.add(file_path)
+                matched = self._search_exact_match(searchable_content, exact_terms)
+            
+            else:
+                matched = False
+            
+            if key is not None:
+                match_cache[key] = matched
+            if matched:
+                matches.append(file_path)
+        
+        # A caller-supplied file list may name a file twice
+        if len(png_files) != len(metadata_results):
+            matches = list(dict.fromkeys(matches))
         
         self.stats['images_matched'] = len(matches)
         self.logger._write_log(f"Found {len(matches)} images matching search criteria")
         
         return matches
     
-    def _extract_searchable_content(self, metadata: Dict, search_fields: Optional[List[str]]) -> Dict[str, str]:
-        """Extract searchable content from metadata"""
-        content = {}
+    def _derive_fields(self, metadata: Dict) -> Dict[str, str]:
+        """
+        Searchable fields pulled out of metadata by the metadata analyzer;
+        extractors whose fields the run doesn't search are skipped
+        """
+        needed = self._needed_sources
+        fields = {}
         
         # Extract key fields using metadata analyzer
-        checkpoints = self.metadata_analyzer.extract_checkpoints(metadata)
-        loras = self.metadata_analyzer.extract_loras(metadata)
-        prompts = self.metadata_analyzer.extract_prompts(metadata)
-        sampling = self.metadata_analyzer.extract_sampling_params(metadata)
-        
-        # Organize searchable content
-        content.update({
-            'checkpoints': ' '.join(checkpoints),
-            'loras': ' '.join(loras),
-            'lora_name': ' '.join(loras),  # Alias for backward compatibility
-            'positive_prompt': prompts.get('positive', ''),
-            'negative_prompt': prompts.get('negative', ''),
-            'prompts': f"{prompts.get('positive', '')} {prompts.get('negative', '')}",
-            'sampling_params': ' '.join(f"{k}:{v}" for k, v in sampling.items()),
-            'full_metadata': json.dumps(metadata).lower()
-        })
-        
-        # If specific fields requested, filter content
+        if needed is None or 'checkpoints' in needed:
+            fields['checkpoints'] = ' '.join(self.metadata_analyzer.extract_checkpoints(metadata))
+        
+        if needed is None or 'loras' in needed:
+            loras = ' '.join(self.metadata_analyzer.extract_loras(metadata))
+            fields['loras'] = loras
+            fields['lora_name'] = loras  # Alias for backward compatibility
+        
+        if needed is None or 'prompts' in needed:
+            prompts = self.metadata_analyzer.extract_prompts(metadata)
+            fields['positive_prompt'] = prompts.get('positive', '')
+            fields['negative_prompt'] = prompts.get('negative', '')
+            fields['prompts'] = f"{prompts.get('positive', '')} {prompts.get('negative', '')}"
+        
+        if needed is None or 'sampling' in needed:
+            sampling = self.metadata_analyzer.extract_sampling_params(metadata)
+            fields['sampling_params'] = ' '.join(f"{k}:{v}" for k, v in sampling.items())
+        
+        return fields
+    
+    def _extract_searchable_content(self, metadata: Dict, search_fields: Optional[List[str]],
+                                    case_sensitive: bool = True, file_path: Optional[str] = None) -> Dict[str, str]:
+        """Extract searchable content from metadata (lowercased once here unless case sensitive)"""
+        # Reuse the fields derived during extraction when available
+        content = self._content_cache.get(file_path)
+        if content is None:
+            content = self._derive_fields(metadata)
+        
+        # If specific fields requested, filter content; the serialized
+        # workflow is only built when a field actually needs it
         if search_fields:
             filtered_content = {}
             for field in search_fields:
                 if field in content:
                     filtered_content[field] = content[field]
                 # Also search in full metadata if field not found
-                if field not in content:
-                    filtered_content['full_metadata'] = content['full_metadata']
+                elif 'full_metadata' not in filtered_content:
+                    filtered_content['full_metadata'] = json.dumps(metadata).lower()
             content = filtered_content
+        else:
+            content = {**content, 'full_metadata': json.dumps(metadata).lower()}
+        
+        if not case_sensitive:
+            content = {field: text.lower() for field, text in content.items()}
         
         return content
     
-    def _search_any_term(self, content: Dict[str, str], terms: List[str], case_sensitive: bool, use_regex: bool) -> bool:
+    def _prepare_terms(self, terms: List[str], case_sensitive: bool, use_regex: bool,
+                       use_re2: bool = False) -> List[Union[str, Pattern]]:
+        """
+        Turn search terms into what _term_matches_content tests: plain strings
+        (lowercased unless case sensitive) or, with use_regex, compiled patterns
+        """
+        prepared = []
+        for term in terms:
+            search_term = term if case_sensitive else term.lower()
+            if use_regex:
+                search_term = self._compile_pattern(search_term, use_re2)
+            prepared.append(search_term)
+        return prepared
+    
+    def _compile_pattern(self, pattern: str, use_re2: bool = False) -> Union[str, Pattern]:
+        """Compile a regex term with re, or with RE2 when requested and installed; logs the engine used"""
+        if use_re2 and re2 is not None:
+            try:
+                compiled = re2.compile(pattern, _RE2_OPTIONS)
+                self.logger._write_log(f"Regex {pattern!r}: RE2")
+                return compiled
+            except Exception:
+                # RE2 has no lookarounds or backreferences; re still handles those
+                pass
+        try:
+            compiled = re.compile(pattern)
+        except re.error:
+            # Fall back to simple string search if regex is invalid
+            self.logger._write_log(f"Regex {pattern!r}: invalid, searched as plain text")
+            return pattern
+        self.logger._write_log(f"Regex {pattern!r}: re")
+        return compiled
+    
+    def _order_terms_by_rarity(
+        self,
+        terms: List[Union[str, Pattern]],
+        png_files: List[str],
+        metadata_results: Dict[str, Optional[Dict]],
+        search_fields: Optional[List[str]],
+        case_sensitive: bool
+    ) -> List[Union[str, Pattern]]:
+        """Terms sorted by how many of the first TERM_SAMPLE_SIZE files with metadata they match"""
+        hits = [0] * len(terms)
+        sampled = 0
+        for file_path in png_files:
+            metadata = metadata_results.get(file_path)
+            if not metadata:
+                continue
+            content = self._extract_searchable_content(metadata, search_fields, case_sensitive, file_path)
+            for i, term in enumerate(terms):
+                if self._term_matches_content(content, term):
+                    hits[i] += 1
+            sampled += 1
+            if sampled == TERM_SAMPLE_SIZE:
+                break
+        
+        # Stable, so equally common terms keep the user's order
+        return [terms[i] for i in sorted(range(len(terms)), key=hits.__getitem__)]
+    
+    def _build_term_automaton(self, terms: List[str]):
+        """Aho-Corasick automaton over the literal terms"""
+        automaton = ahocorasick.Automaton()
+        for term in terms:
+            automaton.add_word(term, term)
+        automaton.make_automaton()
+        return automaton
+    
+    def _search_automaton(self, content: Dict[str, str], automaton) -> bool:
+        """Search for any of the automaton's terms (OR logic)"""
+        for field_content in content.values():
+            if field_content and next(automaton.iter(field_content), None) is not None:
+                return True
+        return False
+    
+    def _search_any_term(self, content: Dict[str, str], terms: List[Union[str, Pattern]]) -> bool:
         """Search for any of the terms (OR logic)"""
         for term in terms:
-            if self._term_matches_content(content, term, case_sensitive, use_regex):
+            if self._term_matches_content(content, term):
                 return True
         return False
     
-    def _search_all_terms(self, content: Dict[str, str], terms: List[str], case_sensitive: bool, use_regex: bool) -> bool:
+    def _search_all_terms(self, content: Dict[str, str], terms: List[Union[str, Pattern]]) -> bool:
         """Search for all terms (AND logic)"""
         for term in terms:
-            if not self._term_matches_content(content, term, case_sensitive, use_regex):
+            if not self._term_matches_content(content, term):
                 return False
         return True
     
-    def _search_exact_match(self, content: Dict[str, str], terms: List[str], case_sensitive: bool) -> bool:
-        """Search for exact matches"""
-        combined_content = ' '.join(content.values())
-        if not case_sensitive:
-            combined_content = combined_content.lower()
-            terms = [t.lower() for t in terms]
+    def _search_exact_match(self, content: Dict[str, str], terms: List[str]) -> bool:
+        """Search for exact matches (terms and content already lowercased unless case sensitive)"""
+        combined_content = None
+        for term in terms:
+            if any(term in field_content for field_content in content.values()):
+                continue
+            # Only a term with a space can match across the ' ' joining two
+            # fields, so only then is the combined text needed
+            if ' ' not in term:
+                return False
+            if combined_content is None:
+                combined_content = ' '.join(content.values())
+            if term not in combined_content:
+                return False
         
-        return all(term in combined_content for term in terms)
+        return True
     
-    def _term_matches_content(self, content: Dict[str, str], term: str, case_sensitive: bool, use_regex: bool) -> bool:
-        """Check if a term matches any content"""
+    def _term_matches_content(self, content: Dict[str, str], term: Union[str, Pattern]) -> bool:
+        """Check if a prepared term (see _prepare_terms) matches any content"""
         for field_content in content.values():
             if not field_content:
                 continue
-                
-            search_text = field_content if case_sensitive else field_content.lower()
-            search_term = term if case_sensitive else term.lower()
             
-            if use_regex:
-                try:
-                    if re.search(search_term, search_text):
-                        return True
-                except re.error:
-                    # Fallback to simple string search if regex is invalid
-                    if search_term in search_text:
-                        return True
-            else:
-                if search_term in search_text:
+            if isinstance(term, str):
+                if term in field_content:
                     return True
+            elif term.search(field_content):
+                return True
         
         return False
     
-    def _organize_by_search_terms(self, matches: Set[str], search_terms: List[str]) -> Dict[str, List[str]]:
+    def _organize_by_search_terms(self, matches: List[str], search_terms: List[str]) -> Dict[str, List[str]]:
         """Organize matches by which search terms they contain"""
         organized = {}
+        if not search_terms:
+            return {"search_results": matches}
+        
+        # Lowercased basenames, computed once rather than once per term;
+        # a single term only ever scans them once, so lower them lazily
+        if len(search_terms) == 1:
+            basenames = ((file_path, os.path.basename(file_path).lower()) for file_path in matches)
+        else:
+            basenames = [(file_path, os.path.basename(file_path).lower()) for file_path in matches]
         
         # For each search term, find files that match it
         for term in search_terms:
-            term_matches = []
-            clean_term = re.sub(r'[<>:"|?*\\\/]', '_', term)  # Clean for folder name
+            clean_term = safe_folder_name(term)  # Clean for folder name
             
-            for file_path in matches:
-                # Simple check - this could be more sophisticated
-                if term.lower() in os.path.basename(file_path).lower():
-                    term_matches.append(file_path)
+            # Simple check - this could be more sophisticated
+            term_lower = term.lower()
+            term_matches = [file_path for file_path, basename in basenames if term_lower in basename]
             
             if term_matches:
                 organized[clean_term] = term_matches
         
         # Add all matches to a general folder if no specific term folders
         if not organized:
-            organized["search_results"] = list(matches)
+            organized["search_results"] = matches
         
         return organized
     
@@ -368,22 +584,19 @@ class MetadataSearchSorter:
         user_prefix: str = ''
     ):
         """Sort search results into folders"""
-        file_count = 0
-        total_files = sum(len(files) for files in organized_results.values())
-        
         # Initialize renaming counters for each folder
         rename_counters = {}
         if rename_files:
             for folder_name in organized_results.keys():
                 rename_counters[folder_name] = 1
         
+        # Plan every destination first, in order; nothing is moved or
+        # copied until the whole plan exists
+        plan = []
         for folder_name, file_list in organized_results.items():
             folder_path = os.path.join(output_dir, folder_name)
             
             for file_path in file_list:
-                file_count += 1
-                self.logger.update_progress(file_count, os.path.basename(file_path))
-                
                 try:
                     # Generate target filename
                     if rename_files:
@@ -394,42 +607,46 @@ class MetadataSearchSorter:
                             new_name = f"{user_prefix}_{folder_name.lower()}_img{counter}{file_ext}"
                         else:
                             new_name = f"{folder_name.lower()}_img{counter}{file_ext}"
-                        dest_path = os.path.join(folder_path, new_name)
+                        # Claimed now, so later files in the plan can't reuse it
+                        self._dest_names.add(folder_path, new_name)
                         rename_counters[folder_name] += 1
                     else:
-                        # Use original filename with conflict resolution
-                        filename = os.path.basename(file_path)
-                        dest_path = os.path.join(folder_path, filename)
-                        # Handle filename conflicts
-                        dest_path = self._resolve_filename_conflict(dest_path)
-                    
-                    # Move or copy the file
-                    if move_files:
-                        shutil.move(file_path, dest_path)
-                        operation = "move"
-                    else:
-                        shutil.copy2(file_path, dest_path)
-                        operation = "copy"
-                    
-                    self.logger.log_file_operation(operation, file_path, dest_path, True)
-                    self.stats['images_sorted'] += 1
+                        # Use original filename, with a free numbered variant on conflict
+                        new_name = self._dest_names.claim(folder_path, os.path.basename(file_path))
+                    plan.append((file_path, os.path.join(folder_path, new_name)))
                     
                 except Exception as e:
                     self.logger.log_error(f"Failed to sort file: {str(e)}", file_path, "File Operation")
-    
-    def _resolve_filename_conflict(self, dest_path: str) -> str:
-        """Resolve filename conflicts by adding numbers"""
-        if not os.path.exists(dest_path):
-            return dest_path
-        
-        base, ext = os.path.splitext(dest_path)
-        counter = 1
         
-        while os.path.exists(dest_path):
-            dest_path = f"{base}_{counter}{ext}"
-            counter += 1
-        
-        return dest_path
+        # Bigger batches of copies run on a thread pool
+        pool = transfer_pool(len(plan), move_files, self._same_device)
+        if pool is not None:
+            transfers = {pool.submit(self._transfer_file, file_path, dest_path, move_files): (file_path, dest_path)
+                         for file_path, dest_path in plan}
+            self.stats['images_sorted'] += finish_transfers(pool, transfers, self.logger, self.logger.update_progress)
+            return
+        
+        for file_count, (file_path, dest_path) in enumerate(plan, 1):
+            self.logger.update_progress(file_count, len(plan), os.path.basename(file_path))
+            try:
+                operation = self._transfer_file(file_path, dest_path, move_files)
+            except Exception as e:
+                self.logger.log_error(f"Failed to sort file: {str(e)}", file_path, "File Operation")
+                continue
+            self.logger.log_file_operation(operation, file_path, dest_path, True)
+            self.stats['images_sorted'] += 1
+    
+    def _transfer_file(self, file_path: str, dest_path: str, move_files: bool) -> str:
+        """Move or copy one file; returns the operation name for the log"""
+        if move_files:
+            self._move_file(file_path, dest_path)
+            return "move"
+        shutil.copy2(file_path, dest_path)
+        return "copy"
+    
+    def _move_file(self, file_path: str, dest_path: str):
+        """Rename in place on the same filesystem, else let shutil copy and delete"""
+        move_file(file_path, dest_path, self._same_device, os.replace)
     
     def _get_results(self) -> Dict[str, any]:
         """Get comprehensive search results"""
@@ -0,0 +1,24 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.diagnostics import SortLogger
+from sorters.checkpoint_sorter import CheckpointSorter
+
+
+def test_reused_sorter_sorts_into_each_runs_output_dir(tmp_path):
+    source = tmp_path / "source"
+    source.mkdir()
+    (source / "modelA_1.png").write_bytes(b"")
+    (source / "modelA_2.png").write_bytes(b"")
+
+    sorter = CheckpointSorter(SortLogger(log_dir=str(tmp_path / "logs")))
+    for output in ("first", "second"):
+        sorter.sort_by_checkpoint(
+            str(source), str(tmp_path / output), move_files=False,
+            create_metadata_files=False, filename_pattern=r"^([^_]+)_"
+        )
+
+    assert sorted(os.listdir(tmp_path / "first" / "modelA")) == ["modelA_1.png", "modelA_2.png"]
+    assert sorted(os.listdir(tmp_path / "second" / "modelA")) == ["modelA_1.png", "modelA_2.png"]
@@ -0,0 +1,23 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.diagnostics import SortLogger
+from sorters.color_sorter import COLOR_CATEGORIES, ColorSorter, _get_category_lut, _nearest_category
+
+
+def test_every_swatch_maps_to_its_own_category(tmp_path):
+    sorter = ColorSorter(SortLogger(log_dir=str(tmp_path)))
+    for category_name, category_colors in COLOR_CATEGORIES.items():
+        for color in category_colors:
+            assert _nearest_category(*color) == category_name, color
+            assert sorter.categorize_color(color) == category_name, color
+
+
+def test_lut_matches_nearest_category():
+    lut = _get_category_lut()
+    levels = range(0, 256, 10)
+    for i, (r, g, b) in enumerate((r, g, b) for r in levels for g in levels for b in levels):
+        if i % 97 == 0:
+            assert lut[i] == _nearest_category(r, g, b), (r, g, b)
@@ -0,0 +1,29 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core.file_ops as file_ops
+from core.file_ops import DestinationNames
+
+
+def test_claim_numbers_names_already_taken(tmp_path):
+    (tmp_path / "img.png").touch()
+    names = DestinationNames()
+    assert names.claim(str(tmp_path), "img.png") == "img_1.png"
+    assert names.claim(str(tmp_path), "img.png") == "img_2.png"
+    assert names.claim(str(tmp_path), "other.png") == "other.png"
+
+
+def test_claim_ignores_case_where_the_filesystem_does(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_ops, "_CASE_INSENSITIVE", True)
+    (tmp_path / "IMG.png").touch()
+    names = DestinationNames()
+    assert names.claim(str(tmp_path), "img.png") == "img_1.png"
+    assert names.claim(str(tmp_path), "Img_1.png") == "Img_1_1.png"
+
+
+def test_claim_keeps_case_distinct_where_the_filesystem_does(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_ops, "_CASE_INSENSITIVE", False)
+    (tmp_path / "IMG.png").touch()
+    assert DestinationNames().claim(str(tmp_path), "img.png") == "img.png"